@@ -1,133 +1,1402 @@
-import heapq
-import math
-import numpy as np
-import matplotlib.pyplot as plt
-from itertools import count
-
-# Heuristics
-def manhattan(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def euclidean(a, b):
-    return math.hypot(a[0] - b[0], a[1] - b[1])
-
-def diagonal(a, b):
-    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
-
-# small global counter to avoid ambiguous heap comparisons
-_counter = count()
-
-# Pathfinding Algorithms 
-def greedy_bfs(grid, start, goal, heuristic):
-    frontier = [(heuristic(start, goal), next(_counter), start)]
-    came_from = {start: None}
-    explored = set()
-
-    while frontier:
-        _, _, current = heapq.heappop(frontier)
-        if current == goal:
-            break
-        explored.add(current)
-
-        for neighbor in get_neighbors(grid, current):
-            if neighbor not in came_from:
-                heapq.heappush(frontier, (heuristic(neighbor, goal), next(_counter), neighbor))
-                came_from[neighbor] = current
-
-    return reconstruct_path(came_from, start, goal), len(explored)
-
-
-def a_star(grid, start, goal, heuristic):
-    frontier = [(heuristic(start, goal), 0, next(_counter), start)]
-    came_from = {start: None}
-    cost_so_far = {start: 0}
-    explored = set()
-
-    while frontier:
-        _, g, _, current = heapq.heappop(frontier)
-        if current == goal:
-            break
-        explored.add(current)
-
-        for neighbor in get_neighbors(grid, current):
-            new_cost = cost_so_far[current] + 1
-            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                cost_so_far[neighbor] = new_cost
-                priority = new_cost + heuristic(neighbor, goal)
-                heapq.heappush(frontier, (priority, new_cost, next(_counter), neighbor))
-                came_from[neighbor] = current
-
-    return reconstruct_path(came_from, start, goal), len(explored)
-
-# Helper
-def get_neighbors(grid, node):
-    rows = len(grid)
-    cols = len(grid[0])
-    directions = [(1,0), (-1,0), (0,1), (0,-1)]  # 4-directional
-    neighbors = []
-    for dx, dy in directions:
-        nx, ny = node[0] + dx, node[1] + dy
-        if 0 <= nx < rows and 0 <= ny < cols:
-            if grid[nx][ny] != 1:  # not a wall
-                neighbors.append((nx, ny))
-    return neighbors
-
-def reconstruct_path(came_from, start, goal):
-    if goal not in came_from:
-        return []  # no path
-    path = []
-    current = goal
-    while current is not None:
-        path.append(current)
-        current = came_from.get(current)
-    return path[::-1]
-
-def visualize(grid, path, start, goal):
-    # ensure grid is numeric ndarray so imshow doesn't choke on mixed types
-    img = np.array(grid, dtype=float)
-    plt.imshow(img, cmap="gray_r")
-    if path:
-        px, py = zip(*path)
-        plt.plot(py, px, linewidth=2)
-    plt.scatter(start[1], start[0], marker="o", label="Start")
-    plt.scatter(goal[1], goal[0], marker="x", label="Goal")
-    plt.legend()
-    plt.gca().invert_yaxis()  # makes (0,0) top-left like matrix indices
-    plt.show()
-
-# Main
-if __name__ == "__main__":
-    grid = [
-        ['S',0,0,0,0],
-        [1,1,0,1,0],
-        [0,0,0,1,0],
-        [0,1,0,0,0],
-        [0,0,0,1,'G']
-    ]
-
-    # Convert S,G to 0 for processing (and ensure all cells are numeric)
-    start, goal = None, None
-    for i in range(len(grid)):
-        for j in range(len(grid[0])):
-            if grid[i][j] == 'S':
-                start = (i, j)
-                grid[i][j] = 0
-            elif grid[i][j] == 'G':
-                goal = (i, j)
-                grid[i][j] = 0
-
-    # make sure rows are integers (avoid mixed-type lists)
-    grid = [[int(cell) for cell in row] for row in grid]
-
-    heuristics = {"Manhattan": manhattan, "Euclidean": euclidean, "Diagonal": diagonal}
-
-    for name, h in heuristics.items():
-        print(f"\n{name} Heuristic")
-
-        path_gbfs, explored_gbfs = greedy_bfs(grid, start, goal, h)
-        print("GBFS -> Path length:", len(path_gbfs), "Nodes explored:", explored_gbfs)
-
-        path_astar, explored_astar = a_star(grid, start, goal, h)
-        print("A*   -> Path length:", len(path_astar), "Nodes explored:", explored_astar)
-
-        visualize(grid, path_astar, start, goal)
+import hashlib
+import heapq
+import math
+import os
+import sys
+import time
+from array import array
+import numpy as np
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+# Heuristics
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def euclidean(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+def diagonal(a, b):
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+SQRT2 = math.sqrt(2)
+INF = float("inf")
+
+def octile(a, b):
+    # exact distance on an open 8-connected grid where a diagonal step costs sqrt(2)
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+# small global counter to avoid ambiguous heap comparisons
+_counter = count()
+
+# Pathfinding Algorithms 
+def greedy_bfs(grid, start, goal, heuristic):
+    if isinstance(grid, NumpyGrid):
+        return _greedy_bfs_flat(grid, start, goal, heuristic)
+    frontier = [(heuristic(start, goal), next(_counter), start)]
+    came_from = {start: None}
+    explored = set()
+
+    while frontier:
+        _, _, current = heapq.heappop(frontier)
+        if current == goal:
+            break
+        explored.add(current)
+
+        for neighbor in get_neighbors(grid, current):
+            if neighbor not in came_from:
+                heapq.heappush(frontier, (heuristic(neighbor, goal), next(_counter), neighbor))
+                came_from[neighbor] = current
+
+    return reconstruct_path(came_from, start, goal), len(explored)
+
+
+def a_star(grid, start, goal, heuristic, diagonal_moves=False, compact=False):
+    if isinstance(grid, CostGrid):
+        if diagonal_moves or compact:
+            raise ValueError("terrain costs only support the default 4-connected search")
+        return _a_star_weighted(grid, start, goal, heuristic)
+    if compact:
+        # array-backed search state for very large maps, 4-connected only
+        if diagonal_moves:
+            raise ValueError("compact mode only supports 4-connected moves")
+        if not isinstance(grid, NumpyGrid):
+            grid = NumpyGrid(grid)
+        return _a_star_compact(grid, start, goal, heuristic)
+    if diagonal_moves:
+        # 8-connected moves, diagonal cost sqrt(2), no cutting past wall corners
+        _check_diagonal_heuristic(heuristic)
+        if not isinstance(grid, NumpyGrid):
+            grid = NumpyGrid(grid)
+        return _a_star_flat_8(grid, start, goal, heuristic)
+    if isinstance(grid, NumpyGrid):
+        return _a_star_flat(grid, start, goal, heuristic)
+    frontier = [(heuristic(start, goal), 0, next(_counter), start)]
+    came_from = {start: None}
+    cost_so_far = {start: 0}
+    explored = set()
+
+    while frontier:
+        _, g, _, current = heapq.heappop(frontier)
+        if current == goal:
+            break
+        explored.add(current)
+
+        for neighbor in get_neighbors(grid, current):
+            new_cost = cost_so_far[current] + 1
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                priority = new_cost + heuristic(neighbor, goal)
+                heapq.heappush(frontier, (priority, new_cost, next(_counter), neighbor))
+                came_from[neighbor] = current
+
+    return reconstruct_path(came_from, start, goal), len(explored)
+
+# NumPy grid backend
+class NumpyGrid:
+    # Flat uint8 copy of the grid with a one-cell wall border around it, so the
+    # searches can step between integer node ids without any bounds checks.
+    def __init__(self, grid):
+        cells = np.asarray(grid, dtype=np.uint8)
+        if cells.ndim != 2:
+            raise ValueError("grid must be two-dimensional")
+        self.rows, self.cols = cells.shape
+        self.width = self.cols + 2
+        padded = np.ones((self.rows + 2, self.width), dtype=np.uint8)
+        padded[1:-1, 1:-1] = cells
+        self.cells = padded.ravel()
+        self.walls = self.cells == 1
+        # indexing bytes gives plain ints, far cheaper than numpy scalars in the search loop
+        self.blocked = self.walls.tobytes()
+        # same order as get_neighbors: down, up, right, left
+        self.offsets = (self.width, -self.width, 1, -1)
+        # 8-connected moves as (offset, cost, side, side); a diagonal step needs both
+        # orthogonal cells beside it open, straight steps just repeat their own offset
+        w = self.width
+        self.moves_8 = tuple((off, 1, off, off) for off in self.offsets) + tuple(
+            (dr * w + dc, SQRT2, dr * w, dc) for dr in (1, -1) for dc in (1, -1))
+
+    def __len__(self):
+        return self.rows
+
+    def __array__(self, dtype=None, copy=None):
+        return self.cells.reshape(self.rows + 2, self.width)[1:-1, 1:-1].astype(dtype or np.uint8)
+
+    def node(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def cell(self, node):
+        r, c = divmod(node, self.width)
+        return (r - 1, c - 1)
+
+    def neighbors(self, node):
+        blocked = self.blocked
+        return [node + off for off in self.offsets if not blocked[node + off]]
+
+    def components(self):
+        # connected-component label per node (0 for walls), computed once and cached
+        if getattr(self, "labels", None) is None:
+            self.labels = _label_components(self)
+        return self.labels
+
+
+# cells up to this integer cost are searched with a bucket queue by dijkstra
+DIAL_MAX_COST = 1024
+
+class CostGrid(NumpyGrid):
+    # Terrain grid: each cell holds the cost of stepping onto it and np.inf marks a
+    # wall. The costs are kept as one contiguous float64 array over the padded node
+    # ids. a_star and dijkstra search with the costs; every other search only sees
+    # the walls.
+    def __init__(self, costs):
+        costs = np.asarray(costs, dtype=np.float64)
+        if costs.ndim != 2:
+            raise ValueError("grid must be two-dimensional")
+        if np.isnan(costs).any() or (costs < 0).any():
+            raise ValueError("terrain costs must be non-negative (np.inf for walls)")
+        walls = np.isinf(costs)
+        super().__init__(walls.astype(np.uint8))
+        padded = np.full((self.rows + 2, self.width), np.inf)
+        padded[1:-1, 1:-1] = costs
+        self.costs = np.ascontiguousarray(padded.ravel())
+        finite = costs[~walls]
+        self.min_cost = float(finite.min()) if finite.size else 0.0
+        self.max_cost = float(finite.max()) if finite.size else 0.0
+        # small integer costs get an int32 copy for the bucket queue
+        self.bucket_costs = None
+        if finite.size and self.max_cost <= DIAL_MAX_COST and np.all(finite == np.floor(finite)):
+            self.bucket_costs = np.where(self.walls, 0, self.costs).astype(np.int32)
+
+
+def _label_components(grid):
+    try:
+        from scipy import ndimage
+    except ImportError:
+        ndimage = None
+    if ndimage is not None:
+        # the default structuring element is the same 4-connectivity the searches use
+        labels, _ = ndimage.label(~grid.walls.reshape(-1, grid.width))
+        return labels.ravel().astype(np.int32)
+
+    blocked, offsets = grid.blocked, grid.offsets
+    labels = [0] * len(blocked)
+    label = 0
+    for seed in np.flatnonzero(~grid.walls).tolist():
+        if labels[seed]:
+            continue
+        label += 1
+        labels[seed] = label
+        stack = [seed]
+        while stack:
+            node = stack.pop()
+            for off in offsets:
+                neighbor = node + off
+                if not blocked[neighbor] and not labels[neighbor]:
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+    return np.array(labels, dtype=np.int32)
+
+
+# Landmark (ALT) heuristics
+class Landmarks:
+    # BFS distance tables from a few landmark cells, one int32 row per landmark over
+    # the padded node ids (-1 where a landmark cannot reach). Used as a heuristic it
+    # returns the triangle-inequality bound max |d(L, goal) - d(L, node)|, which
+    # sees walls, combined with the Manhattan bound.
+    def __init__(self, table, width):
+        self.table = table
+        self.width = width
+        # memoryview indexing yields plain ints without touching numpy per lookup
+        self.views = [memoryview(np.ascontiguousarray(row)) for row in table]
+
+    def __call__(self, a, b):
+        return self.node_heuristic(b)(self._node(a))
+
+    def _node(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def node_heuristic(self, goal):
+        width = self.width
+        target = self._node(goal)
+        gr, gc = divmod(target, width)
+        pairs = [(view, view[target]) for view in self.views if view[target] >= 0]
+
+        def h(node):
+            r, c = divmod(node, width)
+            best = abs(r - gr) + abs(c - gc)
+            for view, d_goal in pairs:
+                d = view[node]
+                if d >= 0:
+                    bound = d - d_goal if d > d_goal else d_goal - d
+                    if bound > best:
+                        best = bound
+            return best
+        return h
+
+    def save(self, path):
+        np.save(path, np.asarray(self.table))
+
+    def __getstate__(self):
+        # memory-mapped tables travel to worker processes as their file name only
+        if isinstance(self.table, np.memmap) and self.table.filename:
+            return {"path": self.table.filename, "width": self.width}
+        return {"table": np.asarray(self.table), "width": self.width}
+
+    def __setstate__(self, state):
+        table = state.get("table")
+        if table is None:
+            table = np.load(state["path"], mmap_mode="r")
+        self.__init__(table, state["width"])
+
+
+def build_landmarks(grid, count=8):
+    # Farthest-point selection: each new landmark is the open cell farthest (by BFS
+    # distance) from the landmarks already chosen, which spreads them to the edges
+    # of the map where their bounds are tightest. Every connected component gets
+    # its own landmarks. Components never overlap, so row k of the table holds the
+    # distances from the k-th landmark of every component at once, and a query
+    # always compares distances from a landmark in its own component.
+    if not isinstance(grid, NumpyGrid):
+        grid = NumpyGrid(grid)
+    labels = grid.components()
+    open_cells = np.flatnonzero(labels)
+    if open_cells.size == 0:
+        raise ValueError("grid has no open cells")
+    table = np.full((count, len(grid.blocked)), -1, dtype=np.int32)
+    # open cells grouped by component
+    order = open_cells[np.argsort(labels[open_cells], kind="stable")]
+    starts = np.flatnonzero(np.diff(labels[order], prepend=0))
+    for cells in np.split(order, starts[1:]):
+        if cells.size == 1:
+            table[0, cells] = 0  # a single cell is its own landmark
+            continue
+        nearest = _bfs_distances(grid, int(cells[0]))[cells]
+        for k in range(count):
+            candidate = int(cells[np.argmax(nearest)])
+            if k and nearest.max() <= 0:
+                break  # every cell of this component is already a landmark
+            row = _bfs_distances(grid, candidate)[cells]
+            table[k, cells] = row
+            nearest = np.minimum(nearest, row) if k else row
+    used = int(np.max(np.flatnonzero((table >= 0).any(axis=1)))) + 1
+    return Landmarks(table[:used], grid.width)
+
+
+def landmarks_key(grid, count=8):
+    # identifies the walls a landmark table was built for (and how many landmarks it
+    # asked for): any change to the map, even one keeping its size, changes the key
+    digest = hashlib.sha256(np.asarray(grid.walls, dtype=np.uint8).tobytes())
+    digest.update(f"{grid.rows}x{grid.cols}:{count}".encode())
+    return digest.hexdigest()
+
+
+def load_landmarks(grid, map_path, count=8):
+    # Memory-maps the landmark table stored next to map_path (map.txt ->
+    # map.landmarks.npy), building and saving it first when it is missing or was
+    # built for other walls. map.landmarks.key holds the landmarks_key of the
+    # table and is written after it, so a table whose key does not match is
+    # never reused.
+    if not isinstance(grid, NumpyGrid):
+        grid = NumpyGrid(grid)
+    base = os.path.splitext(map_path)[0]
+    path, key_path = base + ".landmarks.npy", base + ".landmarks.key"
+    key = landmarks_key(grid, count)
+    if os.path.exists(path) and os.path.exists(key_path):
+        with open(key_path) as f:
+            if f.read().strip() == key:
+                return Landmarks(np.load(path, mmap_mode="r"), grid.width)
+    build_landmarks(grid, count).save(path)
+    with open(key_path, "w") as f:
+        f.write(key + "\n")
+    return Landmarks(np.load(path, mmap_mode="r"), grid.width)
+
+
+def _bfs_distances(grid, source):
+    blocked, offsets = grid.blocked, grid.offsets
+    dist = array("i", [-1]) * len(blocked)
+    dist[source] = 0
+    layer = [source]
+    d = 0
+    while layer:
+        d += 1
+        next_layer = []
+        for node in layer:
+            for off in offsets:
+                neighbor = node + off
+                if not blocked[neighbor] and dist[neighbor] < 0:
+                    dist[neighbor] = d
+                    next_layer.append(neighbor)
+        layer = next_layer
+    return np.frombuffer(dist, dtype=np.int32)
+
+
+def _node_heuristic(grid, heuristic, goal):
+    if isinstance(heuristic, Landmarks):
+        return heuristic.node_heuristic(goal)
+    # the built-in heuristics are inlined on node ids; the +1 border shift cancels out
+    width = grid.width
+    gr, gc = goal[0] + 1, goal[1] + 1
+    if heuristic is manhattan:
+        def h(node):
+            r, c = divmod(node, width)
+            return abs(r - gr) + abs(c - gc)
+    elif heuristic is euclidean:
+        def h(node):
+            r, c = divmod(node, width)
+            return math.hypot(r - gr, c - gc)
+    elif heuristic is diagonal:
+        def h(node):
+            r, c = divmod(node, width)
+            dr, dc = abs(r - gr), abs(c - gc)
+            return dr if dr > dc else dc
+    elif heuristic is octile:
+        # the same float octile() computes, without the max/min calls
+        k = SQRT2 - 1
+        def h(node):
+            r, c = divmod(node, width)
+            dr, dc = abs(r - gr), abs(c - gc)
+            return dr + k * dc if dr > dc else dc + k * dr
+    else:
+        def h(node):
+            r, c = divmod(node, width)
+            return heuristic((r - 1, c - 1), goal)
+    return h
+
+
+def _greedy_bfs_flat(grid, start, goal, heuristic):
+    if heuristic in (manhattan, diagonal, euclidean, octile) or isinstance(heuristic, Landmarks):
+        return _greedy_bfs_flat_int(grid, start, goal, heuristic)
+    h = _node_heuristic(grid, heuristic, goal)
+    offsets = grid.offsets
+    source, target = grid.node(start), grid.node(goal)
+    # walls and already-pushed nodes in one byte mask, so each neighbour takes one check
+    closed = bytearray(grid.blocked)
+    closed[source] = 1
+    push, pop = heapq.heappush, heapq.heappop
+    tie = count().__next__
+    frontier = [(h(source), tie(), source)]
+    came_from = {source: None}
+    explored = 0
+
+    while frontier:
+        _, _, current = pop(frontier)
+        if current == target:
+            break
+        explored += 1  # nodes are pushed once, so each pop is a new node
+
+        for off in offsets:
+            neighbor = current + off
+            if not closed[neighbor]:
+                closed[neighbor] = 1
+                push(frontier, (h(neighbor), tie(), neighbor))
+                came_from[neighbor] = current
+
+    return _flat_path(grid, came_from, target), explored
+
+
+# euclidean and octile distances between grid cells are 0 or at least 1, so scaling
+# them by 2**52 gives exact ints: the same order and the same ties as the floats
+_EXACT = float(1 << 52)
+# math.hypot orders every pair of cell offsets up to this size exactly like the
+# squared distance, ties included (checked exhaustively), so greedy search can key
+# euclidean on dr*dr + dc*dc instead
+_SQUARED_EXACT_UP_TO = 4100
+
+def _greedy_bfs_flat_int(grid, start, goal, heuristic):
+    # Same search with every heap entry a single int. Each node is pushed at most
+    # once, so the t-th push can be keyed by h * size + t: it sorts exactly like the
+    # (h, tie) tuples above, and int comparisons are much cheaper than tuple ones.
+    # pushed[t] holds the node and parents[t] the push it was reached from, which
+    # replaces the came_from dict. Manhattan is inlined.
+    offsets = grid.offsets
+    width, size = grid.width, len(grid.blocked)
+    source, target = grid.node(start), grid.node(goal)
+    closed = bytearray(grid.blocked)
+    closed[source] = 1
+    gr, gc = divmod(target, width)
+    if heuristic is manhattan:
+        h = None
+    elif heuristic is euclidean and max(grid.rows, grid.cols) <= _SQUARED_EXACT_UP_TO:
+        def h(node):
+            r, c = divmod(node, width)
+            dr, dc = r - gr, c - gc
+            return dr * dr + dc * dc
+    elif heuristic is euclidean:
+        hypot = math.hypot
+        def h(node):
+            r, c = divmod(node, width)
+            return int(hypot(r - gr, c - gc) * _EXACT)
+    elif heuristic is octile:
+        k = SQRT2 - 1
+        def h(node):
+            r, c = divmod(node, width)
+            dr, dc = abs(r - gr), abs(c - gc)
+            return int((dr + k * dc if dr > dc else dc + k * dr) * _EXACT)
+    else:
+        h = _node_heuristic(grid, heuristic, goal)
+    push, pop = heapq.heappush, heapq.heappop
+    r, c = divmod(source, width)
+    frontier = [(abs(r - gr) + abs(c - gc) if h is None else h(source)) * size]
+    pushed = [source]
+    parents = [-1]
+    explored = 0
+
+    while frontier:
+        t = pop(frontier) % size
+        current = pushed[t]
+        if current == target:
+            break
+        explored += 1  # nodes are pushed once, so each pop is a new node
+
+        for off in offsets:
+            neighbor = current + off
+            if not closed[neighbor]:
+                closed[neighbor] = 1
+                if h is None:
+                    r, c = divmod(neighbor, width)
+                    push(frontier, (abs(r - gr) + abs(c - gc)) * size + len(pushed))
+                else:
+                    push(frontier, h(neighbor) * size + len(pushed))
+                pushed.append(neighbor)
+                parents.append(t)
+    else:
+        return [], explored  # no path
+
+    path = []
+    while t >= 0:
+        path.append(grid.cell(pushed[t]))
+        t = parents[t]
+    return path[::-1], explored
+
+
+def _a_star_flat(grid, start, goal, heuristic):
+    h = _node_heuristic(grid, heuristic, goal)
+    blocked, offsets = grid.blocked, grid.offsets
+    source, target = grid.node(start), grid.node(goal)
+    push, pop = heapq.heappush, heapq.heappop
+    tie = count().__next__
+    frontier = [(h(source), 0, tie(), source)]
+    came_from = {source: None}
+    cost_so_far = {source: 0}
+    closed = bytearray(len(blocked))
+    explored = 0
+
+    while frontier:
+        _, g, _, current = pop(frontier)
+        if current == target:
+            break
+        if closed[current]:
+            if g > cost_so_far[current]:
+                continue  # stale entry; expanding it again could not improve anything
+        else:
+            closed[current] = 1
+            explored += 1
+
+        new_cost = g + 1
+        for off in offsets:
+            neighbor = current + off
+            if blocked[neighbor]:
+                continue
+            old = cost_so_far.get(neighbor)
+            if old is None or new_cost < old:
+                cost_so_far[neighbor] = new_cost
+                push(frontier, (new_cost + h(neighbor), new_cost, tie(), neighbor))
+                came_from[neighbor] = current
+
+    return _flat_path(grid, came_from, target), explored
+
+
+# heuristic values are stored in fixed point inside packed heap keys; flooring a
+# consistent heuristic keeps it consistent on integer step costs
+_KEY_SCALE = 1 << 16
+# compact search state is allocated in chunks of this many node ids, on first touch
+_CHUNK_BITS = 10
+
+def _a_star_compact(grid, start, goal, heuristic):
+    # Same search as _a_star_flat, but parents live in int32 arrays of node ids,
+    # costs in float32 arrays and the closed set in bitsets. Heap entries are single
+    # ints packing (f, g, node), so no tuples or tie counter are allocated per push.
+    # Ties on (f, g) are broken by node id, so the path may differ from a_star's
+    # while having the same length. The arrays cover 1024 consecutive node ids each
+    # and are only allocated once the search reaches one of them, so a small search
+    # on a huge map does not pay for the whole grid.
+    h = _node_heuristic(grid, heuristic, goal)
+    blocked, offsets = grid.blocked, grid.offsets
+    n = len(blocked)
+    source, target = grid.node(start), grid.node(goal)
+    node_bits = n.bit_length()
+    node_mask = (1 << node_bits) - 1
+    g_shift = node_bits
+    f_shift = 2 * node_bits  # g never exceeds the node count on unit-cost moves
+    scale = _KEY_SCALE
+    push, pop = heapq.heappush, heapq.heappop
+
+    bits = _CHUNK_BITS
+    size, low = 1 << bits, (1 << bits) - 1
+    chunks = (n >> bits) + 1
+    parents, costs, closed = [None] * chunks, [None] * chunks, [None] * chunks
+
+    def allocate(i):
+        parents[i] = array("i", [-1]) * size
+        closed[i] = bytearray(size >> 3)
+        costs[i] = array("f", [INF]) * size
+        return costs[i]
+
+    allocate(source >> bits)[source & low] = 0
+    frontier = [(int(h(source) * scale) << f_shift) | source]
+    explored = 0
+
+    while frontier:
+        key = pop(frontier)
+        current = key & node_mask
+        if current == target:
+            break
+        g = (key >> g_shift) & node_mask
+        i, j = current >> bits, current & low
+        flags = closed[i]
+        byte, bit = j >> 3, 1 << (j & 7)
+        if flags[byte] & bit:
+            if g > costs[i][j]:
+                continue
+        else:
+            flags[byte] |= bit
+            explored += 1
+
+        new_cost = g + 1
+        for off in offsets:
+            neighbor = current + off
+            if blocked[neighbor]:
+                continue
+            i, j = neighbor >> bits, neighbor & low
+            chunk = costs[i] or allocate(i)
+            if new_cost >= chunk[j]:
+                continue
+            chunk[j] = new_cost
+            parents[i][j] = current
+            f = new_cost * scale + int(h(neighbor) * scale)
+            push(frontier, (f << f_shift) | (new_cost << g_shift) | neighbor)
+
+    if target != source and (costs[target >> bits] is None or parents[target >> bits][target & low] < 0):
+        return [], explored  # no path
+    path = []
+    current = target
+    while current >= 0:
+        path.append(grid.cell(current))
+        current = parents[current >> bits][current & low]
+    path.reverse()
+    return path, explored
+
+
+def _a_star_weighted(grid, start, goal, heuristic):
+    # The unit-step heuristic times the cheapest terrain cost never overestimates,
+    # and stays consistent, because every step costs at least that much.
+    if heuristic is None:
+        h = lambda node: 0
+    else:
+        unit, scale = _node_heuristic(grid, heuristic, goal), grid.min_cost
+        h = lambda node: scale * unit(node)
+    blocked, offsets = grid.blocked, grid.offsets
+    costs = memoryview(grid.costs)
+    source, target = grid.node(start), grid.node(goal)
+    push, pop = heapq.heappush, heapq.heappop
+    tie = count().__next__
+    frontier = [(h(source), 0, tie(), source)]
+    came_from = {source: None}
+    cost_so_far = {source: 0}
+    closed = bytearray(len(blocked))
+    explored = 0
+
+    while frontier:
+        _, g, _, current = pop(frontier)
+        if current == target:
+            break
+        if closed[current]:
+            if g > cost_so_far[current]:
+                continue
+        else:
+            closed[current] = 1
+            explored += 1
+
+        for off in offsets:
+            neighbor = current + off
+            if blocked[neighbor]:
+                continue
+            new_cost = g + costs[neighbor]
+            old = cost_so_far.get(neighbor)
+            if old is None or new_cost < old:
+                cost_so_far[neighbor] = new_cost
+                push(frontier, (new_cost + h(neighbor), new_cost, tie(), neighbor))
+                came_from[neighbor] = current
+
+    return _flat_path(grid, came_from, target), explored
+
+
+def dijkstra(grid, start, goal):
+    # Uniform-cost search over terrain costs (a binary grid counts as cost 1 per
+    # step). When every cost is a small integer, a circular bucket (Dial) queue
+    # indexed by distance replaces the heap; otherwise it is a_star without a
+    # heuristic. Returns (path, explored) like a_star.
+    if not isinstance(grid, CostGrid):
+        grid = CostGrid(np.where(np.asarray(grid) == 1, np.inf, 1.0))
+    if grid.bucket_costs is None:
+        return _a_star_weighted(grid, start, goal, None)
+
+    blocked, offsets = grid.blocked, grid.offsets
+    costs = memoryview(grid.bucket_costs)
+    source, target = grid.node(start), grid.node(goal)
+    size = int(grid.max_cost) + 1  # pending distances never span more than this
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(source)
+    dist = {source: 0}
+    came_from = {source: None}
+    pending, d, explored = 1, 0, 0
+
+    while pending:
+        bucket = buckets[d % size]
+        while bucket:
+            current = bucket.pop()
+            pending -= 1
+            if dist[current] != d:
+                continue  # improved since it was queued here
+            if current == target:
+                return _flat_path(grid, came_from, target), explored
+            explored += 1
+            for off in offsets:
+                neighbor = current + off
+                if blocked[neighbor]:
+                    continue
+                new_cost = d + costs[neighbor]
+                old = dist.get(neighbor)
+                if old is None or new_cost < old:
+                    dist[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    buckets[new_cost % size].append(neighbor)
+                    pending += 1
+        d += 1
+
+    return [], explored
+
+
+def _check_diagonal_heuristic(heuristic):
+    # manhattan and the landmark tables (4-connected BFS distances) overestimate once
+    # a diagonal step costs sqrt(2), and the 8-connected searches would then return
+    # longer paths than the shortest one. octile, euclidean and diagonal stay admissible;
+    # other functions cannot be checked and are the caller's responsibility.
+    if heuristic is manhattan or isinstance(heuristic, Landmarks):
+        raise ValueError("8-connected search needs a heuristic that is admissible with "
+                         "diagonal moves (octile, euclidean or diagonal), not "
+                         + ("manhattan" if heuristic is manhattan else "4-connected landmarks"))
+
+
+def _a_star_flat_8(grid, start, goal, heuristic):
+    h = _node_heuristic(grid, heuristic, goal)
+    blocked, moves = grid.blocked, grid.moves_8
+    source, target = grid.node(start), grid.node(goal)
+    push, pop = heapq.heappush, heapq.heappop
+    tie = count().__next__
+    frontier = [(h(source), 0, tie(), source)]
+    came_from = {source: None}
+    cost_so_far = {source: 0}
+    closed = bytearray(len(blocked))
+    explored = 0
+
+    while frontier:
+        _, g, _, current = pop(frontier)
+        if current == target:
+            break
+        if closed[current]:
+            if g > cost_so_far[current]:
+                continue
+        else:
+            closed[current] = 1
+            explored += 1
+
+        for off, step, side_a, side_b in moves:
+            neighbor = current + off
+            if blocked[neighbor] or blocked[current + side_a] or blocked[current + side_b]:
+                continue
+            new_cost = g + step
+            old = cost_so_far.get(neighbor)
+            if old is None or new_cost < old:
+                cost_so_far[neighbor] = new_cost
+                push(frontier, (new_cost + h(neighbor), new_cost, tie(), neighbor))
+                came_from[neighbor] = current
+
+    return _flat_path(grid, came_from, target), explored
+
+
+# Jump Point Search (8-connected, no corner cutting)
+def jump_point_search(grid, start, goal, heuristic=octile):
+    # Same answers as a_star(..., diagonal_moves=True) in path cost, but only the
+    # jump points are pushed on the heap, so open areas cost a few straight scans
+    # instead of thousands of symmetric nodes. explored counts expanded jump points.
+    # Like that mode it rejects manhattan and landmark heuristics.
+    _check_diagonal_heuristic(heuristic)
+    if not isinstance(grid, NumpyGrid):
+        grid = NumpyGrid(grid)
+    h = _node_heuristic(grid, heuristic, goal)
+    width, blocked = grid.width, grid.blocked
+    source, target = grid.node(start), grid.node(goal)
+    push, pop = heapq.heappush, heapq.heappop
+    tie = count().__next__
+    frontier = [(h(source), 0, tie(), source)]
+    came_from = {source: None}
+    cost_so_far = {source: 0}
+    closed = bytearray(len(blocked))
+    explored = 0
+
+    while frontier:
+        _, g, _, current = pop(frontier)
+        if current == target:
+            break
+        if closed[current]:
+            if g > cost_so_far[current]:
+                continue
+        else:
+            closed[current] = 1
+            explored += 1
+
+        r, c = divmod(current, width)
+        for dr, dc in _jps_directions(grid, current, came_from[current]):
+            jump = _jump(grid, current + dr * width + dc, dr, dc, target)
+            if jump is None:
+                continue
+            jr, jc = divmod(jump, width)
+            rows, cols = abs(jr - r), abs(jc - c)
+            new_cost = g + max(rows, cols) + (SQRT2 - 1) * min(rows, cols)
+            old = cost_so_far.get(jump)
+            if old is None or new_cost < old:
+                cost_so_far[jump] = new_cost
+                push(frontier, (new_cost + h(jump), new_cost, tie(), jump))
+                came_from[jump] = current
+
+    if target not in came_from:
+        return [], explored
+    # fill in the straight and diagonal runs between consecutive jump points
+    path = [grid.cell(target)]
+    current = target
+    while came_from[current] is not None:
+        parent = came_from[current]
+        r, c = grid.cell(current)
+        pr, pc = grid.cell(parent)
+        dr, dc = (pr > r) - (pr < r), (pc > c) - (pc < c)
+        while (r, c) != (pr, pc):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+        current = parent
+    return path[::-1], explored
+
+
+def _jps_directions(grid, node, parent):
+    width, blocked = grid.width, grid.blocked
+    if parent is None:
+        return [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                if (dr or dc) and not blocked[node + dr * width + dc]
+                and not blocked[node + dr * width] and not blocked[node + dc]]
+    r, c = divmod(node, width)
+    pr, pc = divmod(parent, width)
+    dr, dc = (r > pr) - (r < pr), (c > pc) - (c < pc)
+    directions = []
+    if dr and dc:
+        open_r, open_c = not blocked[node + dr * width], not blocked[node + dc]
+        if open_r:
+            directions.append((dr, 0))
+        if open_c:
+            directions.append((0, dc))
+        if open_r and open_c:
+            directions.append((dr, dc))
+    elif dc:
+        ahead, below, above = not blocked[node + dc], not blocked[node + width], not blocked[node - width]
+        if ahead:
+            directions.append((0, dc))
+            if below:
+                directions.append((1, dc))
+            if above:
+                directions.append((-1, dc))
+        if below:
+            directions.append((1, 0))
+        if above:
+            directions.append((-1, 0))
+    else:
+        ahead, right, left = not blocked[node + dr * width], not blocked[node + 1], not blocked[node - 1]
+        if ahead:
+            directions.append((dr, 0))
+            if right:
+                directions.append((dr, 1))
+            if left:
+                directions.append((dr, -1))
+        if right:
+            directions.append((0, 1))
+        if left:
+            directions.append((0, -1))
+    return directions
+
+
+def _jump(grid, node, dr, dc, target):
+    # walk from node in direction (dr, dc) until a jump point, a wall or the goal
+    width, blocked = grid.width, grid.blocked
+    step_r = dr * width
+    step = step_r + dc
+    while True:
+        if blocked[node]:
+            return None
+        if node == target:
+            return node
+        if dr and dc:
+            if (_jump(grid, node + step_r, dr, 0, target) is not None
+                    or _jump(grid, node + dc, 0, dc, target) is not None):
+                return node
+            if blocked[node + step_r] or blocked[node + dc]:
+                return None  # the next diagonal step would cut a corner
+        elif dc:
+            if ((not blocked[node - width] and blocked[node - width - dc])
+                    or (not blocked[node + width] and blocked[node + width - dc])):
+                return node  # forced neighbor above or below
+        else:
+            if ((not blocked[node - 1] and blocked[node - 1 - step_r])
+                    or (not blocked[node + 1] and blocked[node + 1 - step_r])):
+                return node  # forced neighbor left or right
+        node += step
+
+
+def _flat_path(grid, came_from, goal):
+    if goal not in came_from:
+        return []  # no path
+    path = []
+    current = goal
+    while current is not None:
+        path.append(grid.cell(current))
+        current = came_from[current]
+    return path[::-1]
+
+# Bidirectional search
+def bidirectional_a_star(grid, start, goal, heuristic):
+    # A* from both ends at once, always growing the smaller frontier. Both sides use
+    # the averaged potential (h_to_goal - h_to_start) / 2 and its negation, which
+    # keeps them consistent with each other, so the search can stop as soon as the
+    # two frontier minimums add up to the best meeting found. It also fails fast
+    # when either side runs out of nodes (the smaller component is exhausted).
+    # Returns (path, explored) like a_star, counting expansions on both sides.
+    if not isinstance(grid, NumpyGrid):
+        grid = NumpyGrid(grid)
+    blocked, offsets = grid.blocked, grid.offsets
+    source, target = grid.node(start), grid.node(goal)
+    if source == target:
+        return [start], 0
+    push, pop = heapq.heappush, heapq.heappop
+    tie = count().__next__
+    # index 0 searches forward from start, index 1 backward from goal; keys are
+    # doubled so integer heuristics keep integer priorities
+    to_goal = _node_heuristic(grid, heuristic, goal)
+    to_start = _node_heuristic(grid, heuristic, start)
+    potential = (lambda node: to_goal(node) - to_start(node),
+                 lambda node: to_start(node) - to_goal(node))
+    frontier = ([(potential[0](source), 0, tie(), source)],
+                [(potential[1](target), 0, tie(), target)])
+    came_from = ({source: None}, {target: None})
+    cost_so_far = ({source: 0}, {target: 0})
+    closed = (bytearray(len(blocked)), bytearray(len(blocked)))
+    explored = 0
+    best, meet = math.inf, None
+
+    while frontier[0] and frontier[1]:
+        if frontier[0][0][0] + frontier[1][0][0] >= 2 * best:
+            break
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        _, g, _, current = pop(frontier[side])
+        costs, other = cost_so_far[side], cost_so_far[1 - side]
+        if closed[side][current]:
+            if g > costs[current]:
+                continue
+        else:
+            closed[side][current] = 1
+            explored += 1
+
+        new_cost = g + 1
+        for off in offsets:
+            neighbor = current + off
+            if blocked[neighbor]:
+                continue
+            old = costs.get(neighbor)
+            if old is None or new_cost < old:
+                costs[neighbor] = new_cost
+                key = 2 * new_cost + potential[side](neighbor)
+                push(frontier[side], (key, new_cost, tie(), neighbor))
+                came_from[side][neighbor] = current
+                if neighbor in other and new_cost + other[neighbor] < best:
+                    best, meet = new_cost + other[neighbor], neighbor
+
+    return _join_path(grid, came_from, meet), explored
+
+
+def bidirectional_bfs(grid, start, goal):
+    # Breadth-first search from both ends, one whole layer of the smaller side at a
+    # time. The first layer that touches the other side holds a shortest path, so
+    # the search stops after that layer. Returns (path, explored) like a_star.
+    if not isinstance(grid, NumpyGrid):
+        grid = NumpyGrid(grid)
+    blocked, offsets = grid.blocked, grid.offsets
+    source, target = grid.node(start), grid.node(goal)
+    if source == target:
+        return [start], 0
+    came_from = ({source: None}, {target: None})
+    depth = ({source: 0}, {target: 0})
+    layers = [[source], [target]]
+    explored = 0
+    best, meet = math.inf, None
+
+    while layers[0] and layers[1] and meet is None:
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        parents, seen, other = came_from[side], depth[side], depth[1 - side]
+        next_layer = []
+        for current in layers[side]:
+            explored += 1
+            d = seen[current] + 1
+            for off in offsets:
+                neighbor = current + off
+                if blocked[neighbor] or neighbor in seen:
+                    continue
+                parents[neighbor] = current
+                seen[neighbor] = d
+                next_layer.append(neighbor)
+                if neighbor in other and d + other[neighbor] < best:
+                    best, meet = d + other[neighbor], neighbor
+        layers[side] = next_layer
+
+    return _join_path(grid, came_from, meet), explored
+
+
+def _join_path(grid, came_from, meet):
+    if meet is None:
+        return []  # no path
+    forward, backward = came_from
+    path = []
+    current = meet
+    while current is not None:
+        path.append(grid.cell(current))
+        current = forward[current]
+    path.reverse()
+    current = backward[meet]
+    while current is not None:
+        path.append(grid.cell(current))
+        current = backward[current]
+    return path
+
+# Batched queries against one map
+_batch_grid = None
+_batch_heuristic = None
+
+def _init_batch_worker(grid, heuristic):
+    global _batch_grid, _batch_heuristic
+    _batch_grid, _batch_heuristic = grid, heuristic
+
+def _batch_query(args):
+    start, goal = args
+    grid, heuristic = _batch_grid, _batch_heuristic
+    labels = grid.components()
+    source, target = grid.node(start), grid.node(goal)
+    if not labels[source] or labels[source] != labels[target]:
+        return [], 0  # wall endpoint or different component: no search needed
+    if isinstance(grid, CostGrid):
+        # terrain costs change the shortest path, so search the way a_star does
+        return _a_star_weighted(grid, start, goal, heuristic)
+    return _a_star_flat(grid, start, goal, heuristic)
+
+def a_star_batch(grid, queries, heuristic=manhattan, workers=1, chunksize=64):
+    # Runs a_star for every (start, goal) pair in queries against one shared map and
+    # returns a list of (path, explored) in the same order (a CostGrid is searched
+    # with its terrain costs). Pairs that can reach each other get exactly what
+    # a_star gives. The others fail fast: a pair with an endpoint on a wall or in
+    # different components returns ([], 0) without searching, where a_star would
+    # explore the whole component before giving up (and would even step off a wall
+    # start). The wall mask and the component labels are built once up front; with
+    # workers > 1 the prepared grid and heuristic are handed to each pool process once
+    # (inherited for free where fork is used; memory-mapped Landmarks are reopened by
+    # file name otherwise).
+    if not isinstance(grid, NumpyGrid):
+        grid = NumpyGrid(grid)
+    grid.components()
+    jobs = [(start, goal) for start, goal in queries]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2:
+        _init_batch_worker(grid, heuristic)
+        return [_batch_query(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(grid, heuristic)) as pool:
+        return list(pool.map(_batch_query, jobs, chunksize=chunksize))
+
+# Incremental replanning (D* Lite)
+
+class DStarLite:
+    # Searches backward from the goal and keeps its g/rhs tables between calls, so
+    # after update_cells() only the part of the search that the flipped cells touch
+    # is repaired. replan() returns (path, explored), where explored counts the
+    # vertices expanded by that call. The planner works on its own copy of the walls.
+    def __init__(self, grid, start, goal, heuristic=manhattan):
+        if not isinstance(grid, NumpyGrid):
+            grid = NumpyGrid(grid)
+        self.grid = grid
+        self.blocked = bytearray(grid.blocked)
+        self.heuristic = heuristic
+        self.start, self.goal = grid.node(start), grid.node(goal)
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.queue = []
+        self.queued = {}  # node -> key of its live heap entry
+        self._h = _node_heuristic(grid, heuristic, start)
+        self._push(self.goal)
+
+    def move_to(self, cell):
+        # the agent advanced; km keeps the keys already on the heap valid
+        self.km += self.heuristic(self.grid.cell(self.start), cell)
+        self.start = self.grid.node(cell)
+        self._h = _node_heuristic(self.grid, self.heuristic, cell)
+
+    def update_cells(self, changes):
+        # changes: {(row, col): value} or [((row, col), value), ...]; 1 is a wall
+        grid = self.grid
+        items = changes.items() if hasattr(changes, "items") else changes
+        for (r, c), value in items:
+            if not (0 <= r < grid.rows and 0 <= c < grid.cols):
+                raise ValueError(f"cell {(r, c)} is outside the grid")
+            node = grid.node((r, c))
+            wall = 1 if value == 1 else 0
+            if self.blocked[node] == wall:
+                continue
+            self.blocked[node] = wall
+            self._update_vertex(node)
+            for off in grid.offsets:
+                if not self.blocked[node + off]:
+                    self._update_vertex(node + off)
+
+    def replan(self):
+        explored = self._compute_shortest_path()
+        g, blocked, offsets = self.g, self.blocked, self.grid.offsets
+        node = self.start
+        if g.get(node, INF) == INF:
+            return [], explored
+        path = [self.grid.cell(node)]
+        for _ in range(len(blocked)):
+            if node == self.goal:
+                return path, explored
+            node = min((node + off for off in offsets if not blocked[node + off]),
+                       key=lambda n: g.get(n, INF))
+            path.append(self.grid.cell(node))
+        return [], explored  # unreachable when the tables are consistent
+
+    def _key(self, node):
+        best = min(self.g.get(node, INF), self.rhs.get(node, INF))
+        return (best + self._h(node) + self.km, best)
+
+    def _push(self, node):
+        key = self._key(node)
+        self.queued[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def _top(self):
+        queue, queued = self.queue, self.queued
+        while queue and queued.get(queue[0][1]) != queue[0][0]:
+            heapq.heappop(queue)  # superseded or removed entry
+        return queue[0] if queue else None
+
+    def _update_vertex(self, node):
+        g, rhs, blocked = self.g, self.rhs, self.blocked
+        if node != self.goal:
+            best = INF
+            if not blocked[node]:
+                for off in self.grid.offsets:
+                    neighbor = node + off
+                    if not blocked[neighbor]:
+                        best = min(best, g.get(neighbor, INF) + 1)
+            if best == INF:
+                rhs.pop(node, None)
+            else:
+                rhs[node] = best
+        self.queued.pop(node, None)
+        if g.get(node, INF) != rhs.get(node, INF):
+            self._push(node)
+
+    def _compute_shortest_path(self):
+        g, rhs, blocked, offsets = self.g, self.rhs, self.blocked, self.grid.offsets
+        start = self.start
+        expanded = 0
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            k_old, node = top
+            if k_old >= self._key(start) and rhs.get(start, INF) == g.get(start, INF):
+                break
+            heapq.heappop(self.queue)
+            del self.queued[node]
+            expanded += 1
+            k_new = self._key(node)
+            if k_old < k_new:
+                self._push(node)
+            elif g.get(node, INF) > rhs.get(node, INF):
+                g[node] = rhs[node]
+                for off in offsets:
+                    if not blocked[node + off]:
+                        self._update_vertex(node + off)
+            else:
+                g.pop(node, None)
+                self._update_vertex(node)
+                for off in offsets:
+                    if not blocked[node + off]:
+                        self._update_vertex(node + off)
+        return expanded
+
+
+def benchmark_replanning(size=200, wall_density=0.15, flips=5, radius=8, seed=0):
+    # An agent walks from the top-left to the bottom-right corner while a few
+    # cells near it flip between wall and floor after every step. D* Lite repairs
+    # its plan; the baseline reruns a_star from the agent's cell on the changed map.
+    rng = np.random.default_rng(seed)
+    cells = (rng.random((size, size)) < wall_density).astype(np.uint8)
+    start, goal = (0, 0), (size - 1, size - 1)
+    cells[start] = cells[goal] = 0
+    planner = DStarLite(cells, start, goal)
+    stats = {"dstar": [0.0, 0], "astar": [0.0, 0]}
+    position, steps = start, 0
+
+    while position != goal:
+        t = time.perf_counter()
+        path, explored = planner.replan()
+        stats["dstar"][0] += time.perf_counter() - t
+        stats["dstar"][1] += explored
+        t = time.perf_counter()
+        _, explored = a_star(NumpyGrid(cells), position, goal, manhattan)
+        stats["astar"][0] += time.perf_counter() - t
+        stats["astar"][1] += explored
+        if len(path) < 2:
+            break  # walled in; both planners agree there is no path
+        position = path[1]
+        planner.move_to(position)
+        steps += 1
+
+        changes = {}
+        for _ in range(flips):
+            r = int(np.clip(position[0] + rng.integers(-radius, radius + 1), 0, size - 1))
+            c = int(np.clip(position[1] + rng.integers(-radius, radius + 1), 0, size - 1))
+            if (r, c) not in (position, goal):
+                changes[(r, c)] = 1 - int(cells[r, c])
+        for (r, c), value in changes.items():
+            cells[r, c] = value
+        planner.update_cells(changes)
+
+    print(f"Replanning benchmark: {size}x{size} map, {steps} agent steps, {flips} flips per step")
+    for name, (seconds, explored) in stats.items():
+        print(f"  {name:6s} -> {seconds:8.3f} s, nodes expanded: {explored}")
+    return stats
+
+# Helper
+def get_neighbors(grid, node):
+    if isinstance(grid, NumpyGrid):
+        return [grid.cell(n) for n in grid.neighbors(grid.node(node))]
+    rows = len(grid)
+    cols = len(grid[0])
+    directions = [(1,0), (-1,0), (0,1), (0,-1)]  # 4-directional
+    neighbors = []
+    for dx, dy in directions:
+        nx, ny = node[0] + dx, node[1] + dy
+        if 0 <= nx < rows and 0 <= ny < cols:
+            if grid[nx][ny] != 1:  # not a wall
+                neighbors.append((nx, ny))
+    return neighbors
+
+def reconstruct_path(came_from, start, goal):
+    if goal not in came_from:
+        return []  # no path
+    path = []
+    current = goal
+    while current is not None:
+        path.append(current)
+        current = came_from.get(current)
+    return path[::-1]
+
+def visualize(grid, path, start, goal, filename=None):
+    if filename is not None:
+        # offscreen: reuse one Agg figure per map shape instead of opening a window
+        img = np.array(grid, dtype=float)
+        renderer = _renderers.get(img.shape)
+        if renderer is None:
+            renderer = _renderers[img.shape] = PathRenderer(img)
+        else:
+            renderer.set_grid(img)
+        renderer.draw(path, start, goal)
+        renderer.save(filename)
+        return
+    # ensure grid is numeric ndarray so imshow doesn't choke on mixed types
+    img = np.array(grid, dtype=float)
+    plt.imshow(img, cmap="gray_r")
+    if path:
+        px, py = zip(*path)
+        plt.plot(py, px, linewidth=2)
+    plt.scatter(start[1], start[0], marker="o", label="Start")
+    plt.scatter(goal[1], goal[0], marker="x", label="Goal")
+    plt.legend()
+    plt.gca().invert_yaxis()  # makes (0,0) top-left like matrix indices
+    plt.show()
+
+# Offscreen rendering
+_renderers = {}
+
+class PathRenderer:
+    # One Agg figure that is reused for every frame: the map image, the explored
+    # overlay, the path line and the start/goal markers are created once and later
+    # frames only swap their data. Nothing goes through pyplot or a GUI backend.
+    def __init__(self, grid, dpi=100, explored_color=(1.0, 0.6, 0.0, 0.45)):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        img = np.array(grid, dtype=float)
+        self.figure = Figure(dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        ax = self.figure.add_subplot()
+        self.image = ax.imshow(img, cmap="gray_r", vmin=0, vmax=1)
+        self.overlay = np.zeros(img.shape + (4,))
+        self.explored_color = explored_color
+        self.frontier = ax.imshow(self.overlay, interpolation="nearest")
+        (self.line,) = ax.plot([], [], linewidth=2)
+        self.start_marker = ax.scatter([0], [0], marker="o", label="Start")
+        self.goal_marker = ax.scatter([0], [0], marker="x", label="Goal")
+        ax.legend()
+        ax.invert_yaxis()  # same orientation as visualize
+
+    def set_grid(self, grid):
+        self.image.set_data(np.array(grid, dtype=float))
+        self.overlay[:] = 0
+        self.frontier.set_data(self.overlay)
+
+    def mark_explored(self, cells):
+        if cells:
+            rows, cols = zip(*cells)
+            self.overlay[rows, cols] = self.explored_color
+            self.frontier.set_data(self.overlay)
+
+    def draw(self, path, start, goal):
+        if path:
+            rows, cols = zip(*path)
+            self.line.set_data(cols, rows)
+        else:
+            self.line.set_data([], [])
+        self.start_marker.set_offsets([[start[1], start[0]]])
+        self.goal_marker.set_offsets([[goal[1], goal[0]]])
+
+    def save(self, filename):
+        self.figure.savefig(filename)
+
+
+def animate_search(grid, start, goal, heuristic, filename, every=100, fps=20):
+    # Writes the A* frontier expanding as an animated GIF (Pillow) or MP4 (ffmpeg),
+    # one frame per `every` expanded nodes, with the final path on the last frame.
+    from matplotlib.animation import FFMpegWriter, PillowWriter
+
+    if not isinstance(grid, NumpyGrid):
+        grid = NumpyGrid(grid)
+    renderer = PathRenderer(grid)
+    renderer.draw([], start, goal)
+    writer = PillowWriter(fps=fps) if filename.lower().endswith(".gif") else FFMpegWriter(fps=fps)
+    expansions = _a_star_expansions(grid, start, goal, heuristic)
+    batch = []
+    with writer.saving(renderer.figure, filename, renderer.figure.dpi):
+        while True:
+            try:
+                batch.append(next(expansions))
+            except StopIteration as done:
+                path = done.value
+                break
+            if len(batch) == every:
+                renderer.mark_explored(batch)
+                writer.grab_frame()
+                batch = []
+        renderer.mark_explored(batch)
+        renderer.draw(path, start, goal)
+        writer.grab_frame()
+    return path
+
+
+def _a_star_expansions(grid, start, goal, heuristic):
+    # _a_star_flat as a generator: yields each cell as it is expanded and returns the path
+    h = _node_heuristic(grid, heuristic, goal)
+    blocked, offsets = grid.blocked, grid.offsets
+    source, target = grid.node(start), grid.node(goal)
+    tie = count().__next__
+    frontier = [(h(source), 0, tie(), source)]
+    came_from = {source: None}
+    cost_so_far = {source: 0}
+    closed = bytearray(len(blocked))
+
+    while frontier:
+        _, g, _, current = heapq.heappop(frontier)
+        if current == target:
+            break
+        if closed[current]:
+            if g > cost_so_far[current]:
+                continue
+        else:
+            closed[current] = 1
+            yield grid.cell(current)
+
+        new_cost = g + 1
+        for off in offsets:
+            neighbor = current + off
+            if blocked[neighbor]:
+                continue
+            old = cost_so_far.get(neighbor)
+            if old is None or new_cost < old:
+                cost_so_far[neighbor] = new_cost
+                heapq.heappush(frontier, (new_cost + h(neighbor), new_cost, tie(), neighbor))
+                came_from[neighbor] = current
+
+    return _flat_path(grid, came_from, target)
+
+# Main
+if __name__ == "__main__":
+    if "--replan-benchmark" in sys.argv:
+        benchmark_replanning()
+        raise SystemExit
+    # --headless DIR writes one PNG per heuristic into DIR instead of showing windows
+    out_dir = sys.argv[sys.argv.index("--headless") + 1] if "--headless" in sys.argv else None
+
+    grid = [
+        ['S',0,0,0,0],
+        [1,1,0,1,0],
+        [0,0,0,1,0],
+        [0,1,0,0,0],
+        [0,0,0,1,'G']
+    ]
+
+    # Convert S,G to 0 for processing (and ensure all cells are numeric)
+    start, goal = None, None
+    for i in range(len(grid)):
+        for j in range(len(grid[0])):
+            if grid[i][j] == 'S':
+                start = (i, j)
+                grid[i][j] = 0
+            elif grid[i][j] == 'G':
+                goal = (i, j)
+                grid[i][j] = 0
+
+    # make sure rows are integers (avoid mixed-type lists)
+    grid = [[int(cell) for cell in row] for row in grid]
+
+    heuristics = {"Manhattan": manhattan, "Euclidean": euclidean, "Diagonal": diagonal}
+
+    for name, h in heuristics.items():
+        print(f"\n{name} Heuristic")
+
+        path_gbfs, explored_gbfs = greedy_bfs(grid, start, goal, h)
+        print("GBFS -> Path length:", len(path_gbfs), "Nodes explored:", explored_gbfs)
+
+        path_astar, explored_astar = a_star(grid, start, goal, h)
+        print("A*   -> Path length:", len(path_astar), "Nodes explored:", explored_astar)
+
+        if out_dir:
+            visualize(grid, path_astar, start, goal, os.path.join(out_dir, f"{name.lower()}.png"))
+        else:
+            visualize(grid, path_astar, start, goal)
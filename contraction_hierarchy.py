@@ -0,0 +1,341 @@
+"""
+Contraction hierarchies for repeated point-to-point queries on one static
+weighted graph in the "terry rat.ipynb" adjacency format (or a CSRGraph).
+
+build_contraction_hierarchy() contracts the nodes one at a time, cheapest
+first, and adds a shortcut edge wherever removing a node would lengthen a
+shortest path. A query then only needs a bidirectional Dijkstra that climbs
+to higher-ranked nodes from both ends, and that search stays tiny even on
+very large graphs. The hierarchy is saved as a single uncompressed .npz and
+loaded back memory-mapped.
+
+    python contraction_hierarchy.py    # validates against plain Dijkstra on random graphs
+"""
+
+import heapq
+import random
+import time
+
+import numpy as np
+
+from graph_search import INF, CSRGraph, dijkstra, load_npz_mmap, number_view
+
+
+class ContractionHierarchy:
+    """
+    Upward graphs of a contracted graph, stored in CSR form over node ranks.
+    fwd holds the edges u -> x with rank[x] > rank[u], at u. bwd holds the
+    edges x -> u with rank[x] > rank[u], also at u. The middle arrays name the
+    node a shortcut skips, or -1 for an original edge.
+    """
+
+    ARRAYS = ("fwd_indptr", "fwd_indices", "fwd_weights", "fwd_middle",
+              "bwd_indptr", "bwd_indices", "bwd_weights", "bwd_middle")
+
+    def __init__(self, arrays, nodes=None, path=None):
+        self.arrays = arrays
+        self.nodes = nodes
+        self.path = path
+        self._index = None
+        self._views = {name: number_view(arrays[name]) for name in self.ARRAYS}
+
+    def __len__(self):
+        return len(self.arrays["fwd_indptr"]) - 1
+
+    def save(self, path):
+        arrays = {name: np.asarray(self.arrays[name]) for name in self.ARRAYS}
+        if self.nodes is not None:
+            arrays["nodes"] = np.asarray(self.nodes)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        arrays = load_npz_mmap(path)
+        return cls(arrays, arrays.get("nodes"), path=path)
+
+    def __getstate__(self):
+        if self.path is not None:
+            return {"path": self.path}
+        return {"arrays": {name: np.asarray(a) for name, a in self.arrays.items()}, "nodes": self.nodes}
+
+    def __setstate__(self, state):
+        if "path" in state:
+            arrays = load_npz_mmap(state["path"])
+            self.__init__(arrays, arrays.get("nodes"), state["path"])
+        else:
+            self.__init__(state["arrays"], state["nodes"])
+
+    def node_id(self, label):
+        if self.nodes is None:
+            return label
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(np.asarray(self.nodes).tolist())}
+        return self._index[label]
+
+    def label(self, node):
+        return node if self.nodes is None else self.nodes[node].item()
+
+    def query(self, source, target):
+        """
+        Shortest (path, cost) from source to target, with the shortcuts
+        unpacked into original edges. Returns ([], inf) when unreachable.
+        """
+        s, t = self.node_id(source), self.node_id(target)
+        v = self._views
+        sides = ((v["fwd_indptr"], v["fwd_indices"], v["fwd_weights"], v["fwd_middle"]),
+                 (v["bwd_indptr"], v["bwd_indices"], v["bwd_weights"], v["bwd_middle"]))
+        dist = ({s: 0}, {t: 0})
+        parent = ({s: None}, {t: None})  # node -> (previous node, middle of that edge)
+        frontier = ([(0, s)], [(0, t)])
+        settled = (set(), set())
+        best, meet = (0, s) if s == t else (INF, None)
+
+        while frontier[0] or frontier[1]:
+            tops = [frontier[i][0][0] if frontier[i] else INF for i in (0, 1)]
+            if min(tops) >= best:
+                break
+            side = 0 if tops[0] <= tops[1] else 1
+            d, u = heapq.heappop(frontier[side])
+            if u in settled[side] or d > dist[side][u]:
+                continue
+            settled[side].add(u)
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best, meet = d + other, u
+            mine = dist[side]
+            # stall on demand: a higher node already reaches u more cheaply, so the
+            # shortest path does not go through u on this side
+            indptr, indices, weights, _ = sides[1 - side]
+            if any(mine.get(indices[k], INF) + weights[k] < d for k in range(indptr[u], indptr[u + 1])):
+                continue
+            indptr, indices, weights, middle = sides[side]
+            for k in range(indptr[u], indptr[u + 1]):
+                x = indices[k]
+                nd = d + weights[k]
+                if nd < mine.get(x, INF):
+                    mine[x] = nd
+                    parent[side][x] = (u, middle[k])
+                    heapq.heappush(frontier[side], (nd, x))
+
+        if meet is None:
+            return [], INF
+        edges = []  # (from, to, middle) in travel order
+        node = meet
+        while parent[0][node] is not None:
+            prev, mid = parent[0][node]
+            edges.append((prev, node, mid))
+            node = prev
+        edges.reverse()
+        node = meet
+        while parent[1][node] is not None:
+            nxt, mid = parent[1][node]
+            edges.append((node, nxt, mid))
+            node = nxt
+        path = [s]
+        for u, x, mid in edges:
+            self._unpack(u, x, mid, path)
+        return [self.label(node) for node in path], best
+
+    def _unpack(self, u, x, mid, path):
+        # expands shortcut u -> x (skipping mid) into original edges, appending nodes after u
+        v = self._views
+        stack = [(u, x, mid)]
+        while stack:
+            a, b, m = stack.pop()
+            if m < 0:
+                path.append(b)
+                continue
+            # a -> m is stored at m's bwd list (a ranks higher); m -> b at m's fwd list
+            first = self._middle_of(v["bwd_indptr"], v["bwd_indices"], v["bwd_middle"], m, a)
+            second = self._middle_of(v["fwd_indptr"], v["fwd_indices"], v["fwd_middle"], m, b)
+            stack.append((m, b, second))
+            stack.append((a, m, first))
+
+    @staticmethod
+    def _middle_of(indptr, indices, middle, row, neighbor):
+        for k in range(indptr[row], indptr[row + 1]):
+            if indices[k] == neighbor:
+                return middle[k]
+        raise KeyError(f"hierarchy is missing an edge between {row} and {neighbor}")
+
+
+def build_contraction_hierarchy(graph, witness_limit=50):
+    """
+    Contracts graph (adjacency dict or CSRGraph) and returns a ContractionHierarchy.
+
+    Nodes are ordered lazily by edge difference (shortcuts added minus edges
+    removed) plus the number of already contracted neighbours. Witness
+    searches stop after witness_limit settled nodes and then add the
+    shortcut, which is always safe.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+    n = len(csr)
+    out = [dict() for _ in range(n)]
+    inn = [dict() for _ in range(n)]
+    for u in range(n):
+        for x, w in csr.get(u):
+            if w < 0:
+                raise ValueError(f"negative weight on edge {csr.label(u)!r} -> {csr.label(x)!r}")
+            if u != x and w < out[u].get(x, INF):
+                out[u][x] = w
+                inn[x][u] = w
+
+    middle = {}  # (u, x) -> contracted node, for shortcut edges still in the graph
+    contracted_neighbors = [0] * n
+    level = [0] * n  # depth in the hierarchy, keeps the contraction spread out
+    fwd = [None] * n
+    bwd = [None] * n
+
+    def shortcuts(v):
+        needed = []
+        outs = list(out[v].items())
+        if not outs:
+            return needed
+        max_out = max(w for _, w in outs)
+        for u, w_uv in inn[v].items():
+            reach = _witness_search(out, u, v, w_uv + max_out, witness_limit)
+            for x, w_vx in outs:
+                if x != u and reach.get(x, INF) > w_uv + w_vx:
+                    needed.append((u, x, w_uv + w_vx))
+        return needed
+
+    def priority(v):
+        needed = shortcuts(v)
+        return 2 * (len(needed) - len(inn[v]) - len(out[v])) + contracted_neighbors[v] + level[v], needed
+
+    queue = [(priority(v)[0], v) for v in range(n)]
+    heapq.heapify(queue)
+    while queue:
+        _, v = heapq.heappop(queue)
+        current, added = priority(v)
+        if queue and current > queue[0][0]:
+            heapq.heappush(queue, (current, v))  # lazy update: no longer the cheapest
+            continue
+        # every neighbour left in the graph is contracted later, i.e. ranks higher
+        fwd[v] = [(x, w, middle.get((v, x), -1)) for x, w in out[v].items()]
+        bwd[v] = [(u, w, middle.get((u, v), -1)) for u, w in inn[v].items()]
+        for u in inn[v]:
+            del out[u][v]
+            contracted_neighbors[u] += 1
+            level[u] = max(level[u], level[v] + 1)
+        for x in out[v]:
+            del inn[x][v]
+            contracted_neighbors[x] += 1
+            level[x] = max(level[x], level[v] + 1)
+        out[v], inn[v] = {}, {}
+        for u, x, w in added:
+            if w < out[u].get(x, INF):
+                out[u][x] = w
+                inn[x][u] = w
+                middle[(u, x)] = v
+
+    arrays = {}
+    for prefix, lists in (("fwd", fwd), ("bwd", bwd)):
+        degrees = np.zeros(n + 1, dtype=np.int64)
+        degrees[1:] = [len(edges) for edges in lists]
+        flat = [edge for edges in lists for edge in edges]
+        weights = [w for _, w, _ in flat]
+        arrays[prefix + "_indptr"] = np.cumsum(degrees)
+        arrays[prefix + "_indices"] = np.array([x for x, _, _ in flat], dtype=np.int64)
+        arrays[prefix + "_weights"] = np.array(weights, dtype=csr.weights.dtype)
+        arrays[prefix + "_middle"] = np.array([m for _, _, m in flat], dtype=np.int64)
+    return ContractionHierarchy(arrays, csr.nodes)
+
+
+def _witness_search(out, source, skip, limit, max_settled):
+    # Dijkstra from source that never enters skip, stops past limit, and settles at
+    # most max_settled nodes. Tentative distances are real path lengths, so any of
+    # them can witness that a shortcut is unnecessary.
+    dist = {source: 0}
+    frontier = [(0, source)]
+    settled = 0
+    while frontier and settled < max_settled:
+        d, u = heapq.heappop(frontier)
+        if d > dist[u]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        for x, w in out[u].items():
+            if x == skip:
+                continue
+            nd = d + w
+            if nd < dist.get(x, INF):
+                dist[x] = nd
+                heapq.heappush(frontier, (nd, x))
+    return dist
+
+
+# -----------------------------
+# Validation against plain Dijkstra
+# -----------------------------
+def random_graph(n, m, seed=0, directed=False, integer=True):
+    """
+    Road-like random graph in the adjacency format: edges only join nodes in
+    neighbouring cells of a coarse grid, and weights follow the distance.
+    """
+    rng = random.Random(seed)
+    coordinates = {i: (rng.uniform(0, 100), rng.uniform(0, 100)) for i in range(n)}
+    side = max(1, int((n / 4) ** 0.5))  # about four nodes per cell
+    cells = {}
+    for i, (x, y) in coordinates.items():
+        cells.setdefault((int(x * side / 100), int(y * side / 100)), []).append(i)
+    graph = {i: [] for i in range(n)}
+    for _ in range(m):
+        u = rng.randrange(n)
+        x, y = coordinates[u]
+        near = cells.get((int(x * side / 100) + rng.randint(-1, 1), int(y * side / 100) + rng.randint(-1, 1)))
+        v = rng.choice(near) if near else u
+        if u == v:
+            continue
+        (x1, y1), (x2, y2) = coordinates[u], coordinates[v]
+        length = ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5 * rng.uniform(1.0, 1.5)
+        w = int(length) + 1 if integer else length
+        graph[u].append((v, w))
+        if not directed:
+            graph[v].append((u, w))
+    return graph, coordinates
+
+
+def validate(graph, hierarchy, queries=200, seed=0):
+    """Compares hierarchy.query with dijkstra on random pairs and returns the number checked."""
+    rng = random.Random(seed)
+    labels = list(graph)
+    weight = {}
+    for u, edges in graph.items():
+        for x, w in edges:
+            weight[(u, x)] = min(w, weight.get((u, x), INF))
+
+    def close(a, b):
+        return a == b or abs(a - b) <= 1e-9 * max(1.0, abs(b))
+
+    for _ in range(queries):
+        s, t = rng.choice(labels), rng.choice(labels)
+        path, cost = hierarchy.query(s, t)
+        _, expected = dijkstra(graph, s, t)
+        if not close(cost, expected):
+            raise AssertionError(f"{s!r} -> {t!r}: hierarchy gives {cost}, dijkstra gives {expected}")
+        if path:
+            total = sum(weight[(u, x)] for u, x in zip(path, path[1:]))
+            if path[0] != s or path[-1] != t or not close(total, cost):
+                raise AssertionError(f"{s!r} -> {t!r}: unpacked path does not add up to {cost}")
+    return queries
+
+
+if __name__ == "__main__":
+    for n, m, directed, integer in ((50, 120, False, True), (300, 900, True, True),
+                                    (2000, 3600, False, False), (5000, 9000, False, True)):
+        graph, _ = random_graph(n, m, seed=n, directed=directed, integer=integer)
+        t = time.perf_counter()
+        ch = build_contraction_hierarchy(graph)
+        built = time.perf_counter() - t
+        checked = validate(graph, ch, queries=100, seed=n)
+        pairs = [(s, (s * 7919) % n) for s in range(0, n, max(1, n // 200))]
+        timings = []
+        for search in (ch.query, lambda s, t: dijkstra(graph, s, t)):
+            t = time.perf_counter()
+            for s, goal in pairs:
+                search(s, goal)
+            timings.append((time.perf_counter() - t) / len(pairs) * 1e3)
+        print(f"n={n:5d} m={m:6d} directed={directed!s:5s} build {built:6.2f}s, {checked} queries match, "
+              f"{timings[0]:.3f} ms/query vs {timings[1]:.3f} ms for dijkstra")
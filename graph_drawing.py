@@ -0,0 +1,148 @@
+"""
+Fast drawing for large graphs in the "terry rat.ipynb" adjacency format.
+
+draw_simple_graph() in the notebook goes through nx.draw and
+draw_networkx_edge_labels, which create one artist per edge and per label and
+stall after a few thousand edges. GraphPlot draws every edge as a single
+LineCollection and every node as a single scatter. It only labels the edges
+that are on screen, at most max_labels of them and longest first, and picks
+them again whenever the view is zoomed or panned. Without an axes it renders
+offscreen on an Agg canvas, so 100k-edge graphs with a highlighted path save
+to a file in seconds.
+
+    plot = GraphPlot(graph, coordinates)
+    plot.highlight(path)
+    plot.save("graph.png")
+"""
+
+import numpy as np
+
+from graph_search import CSRGraph
+
+
+class GraphPlot:
+    """
+    One drawing of a graph (adjacency dict or CSRGraph with coordinates).
+    The edge and node artists are built once; highlight() only swaps the path
+    data, so many paths can be saved from the same figure.
+    """
+
+    def __init__(self, graph, coordinates=None, ax=None, max_labels=200, title=None,
+                 figsize=(10, 8), dpi=100, node_color="lightblue", edge_color="0.4",
+                 label_color="red", path_color="orange"):
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph, coordinates)
+        if coordinates is not None and csr.coordinates is None:
+            csr = CSRGraph(csr.indptr, csr.indices, csr.weights, csr.nodes,
+                           np.array([coordinates[csr.label(i)] for i in range(len(csr))], dtype=np.float64))
+        if csr.coordinates is None:
+            raise ValueError("GraphPlot needs coordinates for every node")
+        self.graph = csr
+        self.xy = np.asarray(csr.coordinates, dtype=np.float64)
+        self.max_labels = max_labels
+        self.label_color = label_color
+
+        # undirected edge list like nx.Graph: one segment per node pair
+        n = len(csr)
+        src = np.repeat(np.arange(n), np.diff(np.asarray(csr.indptr)))
+        dst = np.asarray(csr.indices)
+        pairs = np.sort(np.stack([src, dst], axis=1), axis=1)
+        pairs, first = np.unique(pairs, axis=0, return_index=True)
+        keep = pairs[:, 0] != pairs[:, 1]
+        self.edges = pairs[keep]
+        self.weights = np.asarray(csr.weights)[first[keep]]
+        segments = self.xy[self.edges]
+        self.midpoints = segments.mean(axis=1)
+        self.lengths = np.hypot(*(segments[:, 1] - segments[:, 0]).T)
+
+        if ax is None:
+            # offscreen: a bare Figure on an Agg canvas, never a pyplot window
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+            self.figure = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.figure)
+            ax = self.figure.add_subplot()
+        else:
+            self.figure = ax.figure
+        self.ax = ax
+
+        from matplotlib.collections import LineCollection
+
+        small = n <= max_labels
+        width = 1.0 if small else 0.5
+        self.lines = LineCollection(segments, colors=edge_color, linewidths=width, zorder=1)
+        ax.add_collection(self.lines)
+        size = 700 if small else max(1.0, min(50.0, 2e5 / max(n, 1)))
+        self.nodes = ax.scatter(self.xy[:, 0], self.xy[:, 1], s=size, c=node_color,
+                                edgecolors="black" if small else "none", zorder=2)
+        (self.path_line,) = ax.plot([], [], color=path_color, linewidth=3, zorder=3)
+        self.path_nodes = ax.scatter([], [], s=size, c=path_color,
+                                     edgecolors="black" if small else "none", zorder=4)
+        self.node_labels = []
+        if small:
+            for i, (x, y) in enumerate(self.xy):
+                self.node_labels.append(ax.text(x, y, str(csr.label(i)), ha="center", va="center", zorder=5))
+        self.edge_labels = []
+
+        ax.autoscale_view()
+        ax.margins(0.05)
+        ax.set_axis_off()
+        if title:
+            ax.set_title(title)
+        self.update_labels()
+        ax.callbacks.connect("xlim_changed", self.update_labels)
+        ax.callbacks.connect("ylim_changed", self.update_labels)
+
+    def visible_edges(self):
+        """Indices of the edges to label in the current view, longest first."""
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        mx, my = self.midpoints[:, 0], self.midpoints[:, 1]
+        inside = np.flatnonzero((mx >= x0) & (mx <= x1) & (my >= y0) & (my <= y1))
+        if len(inside) > self.max_labels:
+            # zoomed out too far to read them all: keep the edges with the most room
+            inside = inside[np.argpartition(-self.lengths[inside], self.max_labels - 1)[:self.max_labels]]
+        return inside[np.argsort(-self.lengths[inside], kind="stable")]
+
+    def update_labels(self, ax=None):
+        for text in self.edge_labels:
+            text.remove()
+        self.edge_labels = []
+        if self.max_labels <= 0:
+            return
+        for k in self.visible_edges().tolist():
+            x, y = self.midpoints[k]
+            w = self.weights[k].item()
+            self.edge_labels.append(self.ax.text(
+                x, y, str(w) if isinstance(w, int) else f"{w:g}", color=self.label_color,
+                ha="center", va="center", fontsize=8, zorder=5,
+                bbox=dict(boxstyle="round,pad=0.1", facecolor="white", edgecolor="none", alpha=0.8)))
+
+    def highlight(self, path):
+        """Draws path (a list of node labels) on top of the graph; [] or None clears it."""
+        if path:
+            points = self.xy[[self.graph.node_id(label) for label in path]]
+            self.path_line.set_data(points[:, 0], points[:, 1])
+            self.path_nodes.set_offsets(points)
+        else:
+            self.path_line.set_data([], [])
+            self.path_nodes.set_offsets(np.empty((0, 2)))
+
+    def zoom(self, xlim, ylim):
+        """Sets the view, which also picks the edge labels for it."""
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+
+    def save(self, filename):
+        self.figure.savefig(filename)
+
+
+def draw_large_graph(graph, coordinates=None, path=None, filename=None, ax=None, **options):
+    """
+    Draws graph with GraphPlot and returns it. With filename the figure is
+    rendered offscreen and saved there.
+    """
+    plot = GraphPlot(graph, coordinates, ax=ax, **options)
+    plot.highlight(path)
+    if filename is not None:
+        plot.save(filename)
+    return plot
@@ -0,0 +1,397 @@
+"""
+Shortest paths on the weighted adjacency dicts used in "terry rat.ipynb":
+
+    graph = {'A': [('B', 4), ('C', 2)], ...}
+    coordinates = {'A': (0, 0), ...}
+
+dijkstra() runs on a binary heap by default. With queue="radix" it uses a radix
+heap instead, which needs every weight to be a non-negative integer; it is
+opt-in because it measured no faster than heapq here. a_star() adds a
+straight-line heuristic from the coordinates. Both work on the dict directly,
+so large road-network graphs never need to be copied into networkx. Both
+return (path, cost), with ([], inf) when the target cannot be reached.
+
+CSRGraph stores the same graph as compressed-sparse-row NumPy arrays. It saves
+to .npy files in a directory or to an uncompressed .npz, and loads them back
+memory-mapped, so multi-GB graphs open instantly and are shared read-only
+between worker processes. dijkstra() and a_star() accept it in place of the dict.
+"""
+
+import heapq
+import math
+import os
+import struct
+import zipfile
+from itertools import count
+
+import numpy as np
+
+INF = float("inf")
+
+
+class RadixHeap:
+    """
+    Monotone priority queue for non-negative integer keys.
+    Each pop returns a smallest key, and later pushes may not go below it,
+    which always holds for Dijkstra. Items are filed by the highest bit in
+    which their key differs from the last popped key, so each item is moved
+    at most once per bit instead of being sifted through a binary heap.
+    """
+
+    def __init__(self):
+        self.last = 0
+        self.size = 0
+        self.buckets = [[] for _ in range(65)]
+
+    def __len__(self):
+        return self.size
+
+    def push(self, key, item):
+        if key < self.last:
+            raise ValueError("RadixHeap keys must not decrease below the last popped key")
+        index = (key ^ self.last).bit_length()
+        while index >= len(self.buckets):
+            self.buckets.append([])
+        self.buckets[index].append((key, item))
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            # redistribute the first non-empty bucket around its smallest key
+            bucket = buckets[i]
+            buckets[i] = []
+            self.last = min(key for key, _ in bucket)
+            for key, item in bucket:
+                buckets[(key ^ self.last).bit_length()].append((key, item))
+        self.size -= 1
+        return buckets[0].pop()
+
+
+class CSRGraph:
+    """
+    Compressed sparse row graph. The edges leaving row i are
+    indices[indptr[i]:indptr[i + 1]], with matching weights. nodes maps rows
+    back to the original labels (None when the labels are simply 0..n-1),
+    and coordinates is an optional (n, 2) array used by a_star.
+    """
+
+    def __init__(self, indptr, indices, weights, nodes=None, coordinates=None, path=None):
+        self.indptr, self.indices, self.weights = indptr, indices, weights
+        self.nodes = nodes
+        self.coordinates = coordinates
+        self.path = path  # set when the arrays are memory-mapped from disk
+        self._index = None
+        self._scale = None
+        # memoryviews hand out plain Python numbers without per-element numpy overhead
+        self._indptr_view = number_view(indptr)
+        self._indices_view = number_view(indices)
+        self._weights_view = number_view(weights)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    @classmethod
+    def from_dict(cls, graph, coordinates=None):
+        """Builds the arrays from the {node: [(neighbor, weight), ...]} format."""
+        labels = list(graph)
+        index = {label: i for i, label in enumerate(labels)}
+        for edges in graph.values():
+            for neighbor, _ in edges:
+                if neighbor not in index:
+                    index[neighbor] = len(labels)
+                    labels.append(neighbor)
+
+        degrees = np.zeros(len(labels) + 1, dtype=np.int64)
+        for label, edges in graph.items():
+            degrees[index[label] + 1] = len(edges)
+        indptr = np.cumsum(degrees)
+        edges = [edge for label in labels for edge in graph.get(label, ())]
+        indices = np.fromiter((index[v] for v, _ in edges), dtype=np.int64, count=len(edges))
+        weights = [w for _, w in edges]
+        dtype = np.int64 if all(isinstance(w, int) for w in weights) else np.float64
+        weights = np.array(weights, dtype=dtype)
+        if indices.size and indices.max() < 2 ** 31:
+            indices = indices.astype(np.int32)
+
+        if not (all(isinstance(label, str) for label in labels)
+                or all(isinstance(label, int) for label in labels)):
+            raise ValueError("CSRGraph node labels must be all strings or all integers")
+        nodes = None if labels == list(range(len(labels))) else np.array(labels)
+        coords = None
+        if coordinates is not None:
+            coords = np.array([coordinates[label] for label in labels], dtype=np.float64)
+        return cls(indptr, indices, weights, nodes, coords)
+
+    def to_dict(self):
+        graph = {}
+        for i in range(len(self)):
+            graph[self.label(i)] = [(self.label(v), w) for v, w in self.get(i)]
+        return graph
+
+    def node_id(self, label):
+        if self.nodes is None:
+            return label
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.nodes.tolist())}
+        return self._index[label]
+
+    def label(self, node):
+        return node if self.nodes is None else self.nodes[node].item()
+
+    def get(self, node, default=()):
+        # same interface as the adjacency dict, keyed by row number
+        lo, hi = self._indptr_view[node], self._indptr_view[node + 1]
+        return zip(self._indices_view[lo:hi], self._weights_view[lo:hi])
+
+    def euclidean_scale(self):
+        """Vectorized euclidean_scale() over the stored coordinates, cached."""
+        if self._scale is None:
+            xy = np.asarray(self.coordinates)
+            rows = np.repeat(np.arange(len(self)), np.diff(np.asarray(self.indptr)))
+            lengths = np.hypot(*(xy[rows] - xy[np.asarray(self.indices)]).T)
+            positive = lengths > 0
+            if positive.any():
+                ratio = np.asarray(self.weights)[positive] / lengths[positive]
+                self._scale = max(float(ratio.min()), 0.0)
+            else:
+                self._scale = 1.0
+        return self._scale
+
+    def save(self, path):
+        """Writes an uncompressed .npz when path ends in .npz, else a directory of .npy files."""
+        arrays = {"indptr": self.indptr, "indices": self.indices, "weights": self.weights}
+        if self.nodes is not None:
+            arrays["nodes"] = self.nodes
+        if self.coordinates is not None:
+            arrays["coordinates"] = self.coordinates
+        if path.endswith(".npz"):
+            np.savez(path, **{name: np.asarray(a) for name, a in arrays.items()})
+            return
+        os.makedirs(path, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + ".npy"), np.asarray(array))
+
+    @classmethod
+    def load(cls, path):
+        """Opens a saved graph with every array memory-mapped read-only."""
+        if path.endswith(".npz"):
+            arrays = load_npz_mmap(path)
+        else:
+            arrays = {name[:-4]: _mmap_npy(os.path.join(path, name))
+                      for name in os.listdir(path) if name.endswith(".npy")}
+        return cls(arrays["indptr"], arrays["indices"], arrays["weights"],
+                   arrays.get("nodes"), arrays.get("coordinates"), path=path)
+
+    def __getstate__(self):
+        # graphs loaded from disk reach worker processes as their path and are
+        # mapped again there, so the pages stay shared instead of being pickled
+        if self.path is not None:
+            return {"path": self.path}
+        return {"arrays": (np.asarray(self.indptr), np.asarray(self.indices), np.asarray(self.weights),
+                           self.nodes, self.coordinates)}
+
+    def __setstate__(self, state):
+        if "path" in state:
+            other = CSRGraph.load(state["path"])
+            self.__init__(other.indptr, other.indices, other.weights,
+                          other.nodes, other.coordinates, other.path)
+        else:
+            self.__init__(*state["arrays"])
+
+
+def number_view(array):
+    """
+    Flat memoryview of a numeric array that indexes to plain Python numbers.
+    Arrays read back from .npy headers can carry an explicit byte-order format
+    that memoryview refuses to index, so the view is recast to the native type code.
+    """
+    array = np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("="))
+    return memoryview(array).cast("B").cast(array.dtype.char)
+
+
+def _mmap_npy(path):
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path)  # empty arrays cannot be mapped
+
+
+def load_npz_mmap(path):
+    """
+    Loads every array of an .npz memory-mapped read-only. np.load ignores
+    mmap_mode for .npz, but np.savez stores members uncompressed, so each one
+    is mapped straight from its offset inside the zip (compressed members are read).
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"{info.filename} holds Python objects and cannot be memory-mapped")
+            if math.prod(shape) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                                         order="F" if fortran else "C", offset=f.tell())
+    return arrays
+
+
+def dijkstra(graph, source, target, queue="binary"):
+    """
+    Point-to-point Dijkstra that stops as soon as target is settled.
+    The default queue is a binary heap. queue="radix" opts into RadixHeap,
+    which requires non-negative integer weights and raises ValueError otherwise.
+    """
+    if isinstance(graph, CSRGraph):
+        path, cost = dijkstra(_Rows(graph), graph.node_id(source), graph.node_id(target), queue)
+        return [graph.label(node) for node in path], cost
+    if queue == "radix":
+        return _dijkstra_radix(graph, source, target)
+    if queue != "binary":
+        raise ValueError(f"unknown queue {queue!r} (use 'binary' or 'radix')")
+    return _search(graph, source, target, lambda node: 0)
+
+
+class _Rows:
+    # a CSRGraph seen as a dict keyed by row number, for the dict-based searches
+    def __init__(self, graph):
+        self.graph = graph
+
+    def get(self, node, default=()):
+        return self.graph.get(node, default)
+
+    def items(self):
+        return ((i, self.graph.get(i)) for i in range(len(self.graph)))
+
+
+def a_star(graph, source, target, coordinates=None, scale=None):
+    """
+    A* with a straight-line heuristic from coordinates.
+
+    The distance is multiplied by euclidean_scale(graph, coordinates), so it
+    never exceeds any edge weight and stays admissible when the coordinates
+    are not drawn to the same scale as the weights. Computing the scale takes
+    one pass over the edges. For repeated queries, compute it once and pass it
+    in. Without coordinates there is no heuristic: use dijkstra instead.
+    """
+    if coordinates is None and getattr(graph, "coordinates", None) is None:
+        raise ValueError("a_star needs coordinates; use dijkstra")
+    if isinstance(graph, CSRGraph):
+        if coordinates is None:
+            coordinates = graph.coordinates.tolist()
+            scale = graph.euclidean_scale() if scale is None else scale
+        else:
+            coordinates = [coordinates[graph.label(i)] for i in range(len(graph))]
+        path, cost = a_star(_Rows(graph), graph.node_id(source), graph.node_id(target),
+                            coordinates, scale)
+        return [graph.label(node) for node in path], cost
+    if scale is None:
+        scale = euclidean_scale(graph, coordinates)
+    tx, ty = coordinates[target]
+
+    def h(node):
+        x, y = coordinates[node]
+        return scale * math.hypot(x - tx, y - ty)
+
+    return _search(graph, source, target, h)
+
+
+def euclidean_scale(graph, coordinates):
+    """
+    Largest factor s with s * distance(u, v) <= weight(u, v) on every edge.
+    The straight-line heuristic times s is then consistent.
+    """
+    scale = INF
+    for node, edges in graph.items():
+        x, y = coordinates[node]
+        for neighbor, weight in edges:
+            nx_, ny_ = coordinates[neighbor]
+            d = math.hypot(x - nx_, y - ny_)
+            if d > 0:
+                scale = min(scale, weight / d)
+    return 1.0 if scale == INF else max(scale, 0.0)
+
+
+def _search(graph, source, target, h):
+    push, pop = heapq.heappush, heapq.heappop
+    tie = count().__next__
+    frontier = [(h(source), 0, tie(), source)]
+    came_from = {source: None}
+    cost_so_far = {source: 0}
+    closed = set()
+
+    while frontier:
+        _, g, _, current = pop(frontier)
+        if current == target:
+            return _reconstruct(came_from, target), g
+        if current in closed:
+            if g > cost_so_far[current]:
+                continue
+        else:
+            closed.add(current)
+
+        for neighbor, weight in graph.get(current, ()):
+            if weight < 0:
+                raise ValueError(f"negative weight on edge {current!r} -> {neighbor!r}")
+            new_cost = g + weight
+            old = cost_so_far.get(neighbor)
+            if old is None or new_cost < old:
+                cost_so_far[neighbor] = new_cost
+                push(frontier, (new_cost + h(neighbor), new_cost, tie(), neighbor))
+                came_from[neighbor] = current
+
+    return [], INF
+
+
+def _dijkstra_radix(graph, source, target):
+    frontier = RadixHeap()
+    frontier.push(0, source)
+    came_from = {source: None}
+    dist = {source: 0}
+
+    while frontier:
+        d, current = frontier.pop()
+        if d > dist[current]:
+            continue  # stale entry
+        if current == target:
+            return _reconstruct(came_from, target), d
+        for neighbor, weight in graph.get(current, ()):
+            if not isinstance(weight, int) or weight < 0:
+                raise ValueError(f"radix queue needs non-negative integer weights, got {weight!r}")
+            new_cost = d + weight
+            old = dist.get(neighbor)
+            if old is None or new_cost < old:
+                dist[neighbor] = new_cost
+                came_from[neighbor] = current
+                frontier.push(new_cost, neighbor)
+
+    return [], INF
+
+
+def _reconstruct(came_from, target):
+    path = []
+    current = target
+    while current is not None:
+        path.append(current)
+        current = came_from[current]
+    return path[::-1]
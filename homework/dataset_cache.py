@@ -0,0 +1,184 @@
+"""
+On-disk cache for the CSV datasets of the homework scripts.
+
+"telecom homework.py" used to read its CSV from GitHub on every run, which
+fails on machines without network and parses the same text each time.
+load_dataset() parses a source once and stores it as one .npy file per
+column. The cache entry is keyed by a hash of the source: the URL for remote
+files, and the file contents for local ones, so an edited file is parsed
+again. The content hash of a local file is recorded with its size and
+modification time and only computed again when those change, so later runs
+load the columns memory-mapped without parsing or even reading the CSV.
+Text columns are stored as fixed-width Unicode arrays, which can be mapped
+too.
+
+A local copy of the file can stand in for the URL. Pass local=, or set
+DATASET_<NAME> (e.g. DATASET_TELCO_CUSTOMER_CHURN for
+"Telco Customer Churn.csv"). The cache lives in DATASET_CACHE, by default
+~/.cache/aiml-datasets.
+
+    df = load_dataset(URL)                              # network once, then cached
+    df = load_dataset(URL, local="telco.csv")           # no network at all
+    columns = load_columns(URL)                         # {name: memory-mapped array}, no pandas
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from urllib.parse import unquote, urlparse
+
+import numpy as np
+
+FORMAT = 1  # bump when the layout of a cache entry changes
+
+
+def cache_dir():
+    return os.environ.get("DATASET_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "aiml-datasets"))
+
+
+def override_variable(source):
+    """The environment variable that can point at a local copy of source, e.g. DATASET_TELCO_CUSTOMER_CHURN."""
+    stem = os.path.splitext(os.path.basename(unquote(urlparse(str(source)).path)))[0]
+    return "DATASET_" + re.sub(r"[^0-9A-Za-z]+", "_", stem).strip("_").upper()
+
+
+def resolve(source, local=None):
+    """The file or URL that will actually be read: local, then the override variable, then source."""
+    return local or os.environ.get(override_variable(source)) or source
+
+
+def source_key(source, read_csv_options=None):
+    """
+    Hex digest naming the cache entry: of the URL for remote sources, of the
+    bytes for local files, and of the read_csv options that parse them.
+    """
+    digest = hashlib.sha256(f"v{FORMAT}\n".encode())
+    digest.update(json.dumps(read_csv_options or {}, sort_keys=True, default=str).encode() + b"\n")
+    if _is_remote(source):
+        digest.update(b"url\n" + str(source).encode())
+    else:
+        digest.update(b"file\n")
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_source_key(source, read_csv_options=None):
+    """
+    source_key() without reading a local file again while its size and
+    modification time match the ones recorded when it was last hashed.
+    """
+    if _is_remote(source):
+        return source_key(source, read_csv_options)
+    stat = os.stat(source)
+    options = json.dumps(read_csv_options or {}, sort_keys=True, default=str)
+    name = hashlib.sha256(f"{os.path.abspath(source)}\n{options}".encode()).hexdigest()
+    record = os.path.join(cache_dir(), "files", name + ".json")
+    try:
+        with open(record) as f:
+            seen = json.load(f)
+        if seen["size"] == stat.st_size and seen["mtime_ns"] == stat.st_mtime_ns:
+            return seen["key"]
+    except (OSError, ValueError, KeyError):
+        pass
+    key = source_key(source, read_csv_options)
+    os.makedirs(os.path.dirname(record), exist_ok=True)
+    partial = f"{record}.{os.getpid()}"
+    with open(partial, "w") as f:
+        json.dump({"path": os.path.abspath(source), "size": stat.st_size,
+                   "mtime_ns": stat.st_mtime_ns, "key": key}, f)
+    os.replace(partial, record)
+    return key
+
+
+def _is_remote(source):
+    return urlparse(str(source)).scheme in ("http", "https", "ftp")
+
+
+def load_columns(source, local=None, refresh=False, **read_csv_options):
+    """
+    {column name: array} for source, parsed and cached on the first call and
+    memory-mapped from the cache afterwards. Text columns come back as
+    fixed-width Unicode arrays. Missing text is "", and its positions are
+    under the name "<column>.missing" when there are any.
+    """
+    source = resolve(source, local)
+    entry = os.path.join(cache_dir(), cached_source_key(source, read_csv_options))
+    if refresh or not os.path.exists(os.path.join(entry, "columns.json")):
+        _store(source, entry, read_csv_options)
+    with open(os.path.join(entry, "columns.json")) as f:
+        meta = json.load(f)
+    columns = {}
+    for i, column in enumerate(meta["columns"]):
+        columns[column["name"]] = np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="r")
+        if column["missing"]:
+            columns[column["name"] + ".missing"] = np.load(os.path.join(entry, f"{i}.missing.npy"), mmap_mode="r")
+    return columns
+
+
+def load_dataset(source, local=None, refresh=False, **read_csv_options):
+    """
+    The DataFrame pd.read_csv(source) would give (with the same column
+    order), read from the cache. Numeric columns wrap the memory-mapped
+    arrays without copying them.
+    """
+    import pandas as pd
+
+    columns = load_columns(source, local, refresh, **read_csv_options)
+    data = {}
+    for name, values in columns.items():
+        if name.endswith(".missing") and name[:-len(".missing")] in columns:
+            continue
+        if values.dtype.kind == "U":
+            series = pd.Series(values)
+            missing = columns.get(name + ".missing")
+            if missing is not None:
+                series[np.asarray(missing)] = np.nan
+            data[name] = series
+        else:
+            data[name] = pd.Series(values, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def _store(source, entry, read_csv_options):
+    import pandas as pd
+
+    try:
+        df = pd.read_csv(source, **read_csv_options)
+    except OSError as exc:
+        if _is_remote(source):
+            raise OSError(f"could not download {source} ({exc}); pass local= or set "
+                          f"{override_variable(source)} to a local copy of the file") from exc
+        raise
+    os.makedirs(cache_dir(), exist_ok=True)
+    # write into a temporary directory and rename it, so a crash never leaves half an entry
+    partial = tempfile.mkdtemp(prefix=".partial-", dir=cache_dir())
+    try:
+        meta = {"source": str(source), "rows": len(df), "columns": []}
+        for i, name in enumerate(df.columns):
+            values, missing = _column_array(df[name])
+            np.save(os.path.join(partial, f"{i}.npy"), values)
+            if missing is not None:
+                np.save(os.path.join(partial, f"{i}.missing.npy"), missing)
+            meta["columns"].append({"name": str(name), "dtype": values.dtype.str, "missing": missing is not None})
+        with open(os.path.join(partial, "columns.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(partial, entry)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+
+
+def _column_array(series):
+    # numeric, boolean and datetime columns keep their dtype; everything else
+    # becomes fixed-width text, since object arrays cannot be memory-mapped
+    if series.dtype.kind in "biufcmM":
+        return series.to_numpy(), None
+    missing = series.isna().to_numpy()
+    values = series.astype(object).where(~missing, "").astype(str).to_numpy(dtype=str)
+    return values, missing if missing.any() else None
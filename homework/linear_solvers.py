@@ -0,0 +1,189 @@
+"""
+Three ways to fit y = m*x + c (or several features and an intercept), for
+the data of "tensor flow.ipynb" and "home work 2.ipynb":
+
+    closed_form  least squares on centered data, the np.cov / np.var slope of
+                 home work 2 generalised to several features. One pass, no tuning.
+    sgd          mini-batch gradient descent in NumPy. Every epoch walks a fresh
+                 random permutation of the rows in batches.
+    tf           full-batch gradient descent like the GradientTape loop of the
+                 notebook, but the whole loop is one @tf.function graph instead
+                 of 200 eager steps. TensorFlow is imported only for this solver.
+
+Both iterative solvers work on standardized features (mean 0, variance 1)
+and map the result back, so a single learning rate suits any data. tf stops
+once a step lowers the mean squared error by less than tol relative to the
+previous one. sgd halves its learning rate after every epoch that does not
+lower the best loss so far by more than tol relative. It stops after
+patience such epochs in a row and returns the best weights. Every fit reports how long it took to
+converge, which shows the cheapest solver for a dataset size:
+
+    fit = fit_line(X, Y, solver="closed_form")
+    fit["slope"], fit["intercept"], fit["seconds"]
+
+    python linear_solvers.py    # every solver on growing synthetic datasets
+"""
+
+import argparse
+import importlib.util
+import time
+
+import numpy as np
+
+SOLVERS = ("closed_form", "sgd", "tf")
+
+
+def fit_line(x, y, solver="closed_form", **options):
+    """
+    Fits y against x (one column for a 1-D x). Returns a dict with coef (one
+    entry per feature), slope (coef[0]), intercept, mse, steps (epochs for
+    sgd, gradient steps for tf, 0 for closed_form), converged and seconds.
+    options go to the solver: learning_rate, tol, max_epochs, batch_size,
+    seed and patience for sgd, and learning_rate, tol and max_steps for tf.
+    """
+    X = np.asarray(x, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, None]
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if len(X) != len(y) or not len(y):
+        raise ValueError("x and y must have the same, non-zero number of rows")
+    if solver == "closed_form":
+        fitter = _closed_form
+    elif solver == "sgd":
+        fitter = _sgd
+    elif solver == "tf":
+        fitter = _tf
+    else:
+        raise ValueError(f"unknown solver {solver!r} (use one of {', '.join(SOLVERS)})")
+    t = time.perf_counter()
+    coef, intercept, steps, converged = fitter(X, y, **options)
+    seconds = time.perf_counter() - t
+    residual = y - (X @ coef + intercept)
+    return {
+        "solver": solver,
+        "coef": coef,
+        "slope": float(coef[0]),
+        "intercept": float(intercept),
+        "mse": float(residual @ residual / len(y)),
+        "steps": steps,
+        "converged": converged,
+        "seconds": seconds,
+    }
+
+
+def _closed_form(X, y):
+    mean_x, mean_y = X.mean(axis=0), y.mean()
+    xc = X - mean_x
+    # cov(x, y) / var(x) for one feature; lstsq also copes with constant columns
+    coef = np.linalg.lstsq(xc.T @ xc, xc.T @ (y - mean_y), rcond=None)[0]
+    return coef, mean_y - mean_x @ coef, 0, True
+
+
+def _standardize(X):
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    return (X - mean) / scale, mean, scale
+
+
+def _unstandardize(w, b, mean, scale):
+    coef = w / scale
+    return coef, b - mean @ coef
+
+
+def _sgd(X, y, learning_rate=0.1, tol=1e-6, max_epochs=200, batch_size=256, seed=0, patience=5):
+    Z, mean, scale = _standardize(X)
+    rng = np.random.default_rng(seed)
+    n = len(y)
+    w = np.zeros(Z.shape[1])
+    b = 0.0
+    best = float(y @ y / n)  # the loss of the starting point w = 0, b = 0
+    best_w, best_b = w.copy(), b
+    stale = 0
+    for epoch in range(1, max_epochs + 1):
+        order = rng.permutation(n)
+        # one gather per epoch, then every batch is a contiguous slice
+        Ze, ye = Z[order], y[order]
+        for lo in range(0, n, batch_size):
+            zb, yb = Ze[lo:lo + batch_size], ye[lo:lo + batch_size]
+            error = zb @ w + b - yb
+            w -= learning_rate * 2 * (zb.T @ error) / len(yb)
+            b -= learning_rate * 2 * error.mean()
+        residual = Z @ w + b - y
+        loss = residual @ residual / n
+        if best - loss > tol * best:
+            best, best_w, best_b = loss, w.copy(), b
+            stale = 0
+            continue
+        # mini-batch noise keeps the loss bouncing around its floor: halve the
+        # step on every epoch that does not beat the best loss, and stop after
+        # patience such epochs in a row
+        stale += 1
+        learning_rate /= 2
+        if stale >= patience:
+            return (*_unstandardize(best_w, best_b, mean, scale), epoch, True)
+    return (*_unstandardize(best_w, best_b, mean, scale), max_epochs, False)
+
+
+def _tf(X, y, learning_rate=0.1, tol=1e-9, max_steps=10_000):
+    try:
+        import tensorflow as tf
+    except ImportError as exc:
+        raise ImportError("the tf solver needs TensorFlow (pip install tensorflow)") from exc
+    Z, mean, scale = _standardize(X)
+    z = tf.constant(Z)
+    t = tf.constant(y)
+    w = tf.Variable(tf.zeros(Z.shape[1], dtype=tf.float64))
+    b = tf.Variable(tf.constant(0.0, dtype=tf.float64))
+
+    @tf.function
+    def train():
+        previous = tf.constant(np.inf, dtype=tf.float64)
+        steps = tf.constant(0)
+        converged = tf.constant(False)
+        for step in tf.range(1, max_steps + 1):
+            with tf.GradientTape() as tape:
+                loss = tf.reduce_mean(tf.square(tf.linalg.matvec(z, w) + b - t))
+            gw, gb = tape.gradient(loss, [w, b])
+            w.assign_sub(learning_rate * gw)
+            b.assign_sub(learning_rate * gb)
+            steps = step
+            if step > 1 and previous - loss <= tol * previous:
+                converged = tf.constant(True)
+                break
+            previous = loss
+        return steps, converged
+
+    steps, converged = train()
+    return (*_unstandardize(w.numpy(), float(b.numpy()), mean, scale), int(steps), bool(converged))
+
+
+def benchmark(sizes=(100, 10_000, 1_000_000), seed=0, log=print):
+    """Fits y = 3x + 2 + noise, as in the notebook, with every available solver at every size."""
+    solvers = ["closed_form", "sgd"]
+    if importlib.util.find_spec("tensorflow") is not None:
+        t = time.perf_counter()
+        import tensorflow  # noqa: F401  (timed once here so the fits below do not include it)
+        log(f"importing TensorFlow took {time.perf_counter() - t:.2f} s")
+        solvers.append("tf")
+    else:
+        log("TensorFlow is not installed; skipping the tf solver")
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        X = rng.uniform(0, 10, n)
+        Y = 3 * X + 2 + rng.normal(size=n) * 1.5
+        for solver in solvers:
+            fit = fit_line(X, Y, solver)
+            results.append((n, fit))
+            log(f"n={n:>10,}  {solver:<12} {fit['seconds'] * 1e3:10.2f} ms  steps={fit['steps']:<6} "
+                f"converged={fit['converged']!s:<5}  m={fit['slope']:.4f}  c={fit['intercept']:.4f}  "
+                f"mse={fit['mse']:.4f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every linear regression solver on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    args = parser.parse_args()
+    benchmark(args.sizes)
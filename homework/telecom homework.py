@@ -2,123 +2,190 @@
 Homework: K-Means Clustering & PCA on Telecom Data
 Dataset: Telco Customer Churn (Kaggle)
 Goal: Discover customer segments using unsupervised learning
+
+Every step is a function, and pandas, sklearn and matplotlib are imported
+inside the steps that use them, so loading this file costs only NumPy and
+--no-plots skips matplotlib entirely. The CSV is downloaded and parsed once,
+then loaded from the dataset_cache.py cache. --local (or
+DATASET_TELCO_CUSTOMER_CHURN) points at a local copy of the file for
+machines without network.
+
+    python "telecom homework.py" [--no-plots] [--local telco.csv]
 """
 
 # --- Import libraries ---
-import pandas as pd
+import argparse
+
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
+
+import dataset_cache
+
+URL = "https://raw.githubusercontent.com/ybifoundation/Dataset/main/Telco%20Customer%20Churn.csv"
+K_RANGE = range(2, 10)
+
 
 # -----------------------------
 # Part A: Load and preprocess data
 # -----------------------------
-print("📥 Loading dataset...")
+def load_dataset(source=URL, local=None, refresh=False):
+    # parsed once, then memory-mapped from the .npy cache (see dataset_cache.py)
+    return dataset_cache.load_dataset(source, local, refresh)
 
-url = "https://raw.githubusercontent.com/ybifoundation/Dataset/main/Telco%20Customer%20Churn.csv"
-df = pd.read_csv(url)
 
-print(f"Data loaded successfully with shape: {df.shape}")
-print("\nPreview of dataset:")
-print(df.head())
+def preprocess(df):
+    """Cleans df in place and returns (df_encoded, X_scaled)."""
+    import pandas as pd
+    from sklearn.preprocessing import StandardScaler
 
-# Drop the customer ID (not useful for clustering)
-df.drop('customerID', axis=1, inplace=True)
+    # Drop the customer ID (not useful for clustering)
+    df.drop('customerID', axis=1, inplace=True)
 
-# Convert TotalCharges to numeric (some entries are blank)
-df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
-df['TotalCharges'].fillna(df['TotalCharges'].median(), inplace=True)
+    # Convert TotalCharges to numeric (some entries are blank)
+    df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
+    df['TotalCharges'] = df['TotalCharges'].fillna(df['TotalCharges'].median())
 
-# Encode categorical variables (convert Yes/No etc. to 1/0)
-df_encoded = pd.get_dummies(df, drop_first=True)
+    # Encode categorical variables (convert Yes/No etc. to 1/0)
+    df_encoded = pd.get_dummies(df, drop_first=True)
 
-# Standardize numeric values to have mean 0 and variance 1
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(df_encoded)
+    # Standardize numeric values to have mean 0 and variance 1
+    scaler = StandardScaler()
+    return df_encoded, scaler.fit_transform(df_encoded)
 
-print("\n✅ Data preprocessing complete!")
 
 # -----------------------------
 # Part B: PCA – Dimensionality Reduction
 # -----------------------------
-print("\n🔍 Applying PCA to reduce data to 2 dimensions...")
+def pca_2d(X_scaled):
+    """(X_pca, explained variance ratios) of a 2-component PCA."""
+    from sklearn.decomposition import PCA
 
-pca = PCA(n_components=2)
-X_pca = pca.fit_transform(X_scaled)
+    pca = PCA(n_components=2)
+    return pca.fit_transform(X_scaled), pca.explained_variance_ratio_
 
-explained_var = np.sum(pca.explained_variance_ratio_)
-print(f"Total variance explained by 2 components: {explained_var:.2%}")
 
-# Visualize PCA results
-plt.figure(figsize=(8, 6))
-plt.scatter(X_pca[:, 0], X_pca[:, 1], s=10, alpha=0.5)
-plt.title('PCA: 2D Projection of Telecom Customers')
-plt.xlabel('Principal Component 1')
-plt.ylabel('Principal Component 2')
-plt.show()
+def plot_pca(X_pca):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 6))
+    plt.scatter(X_pca[:, 0], X_pca[:, 1], s=10, alpha=0.5)
+    plt.title('PCA: 2D Projection of Telecom Customers')
+    plt.xlabel('Principal Component 1')
+    plt.ylabel('Principal Component 2')
+    plt.show()
+
 
 # -----------------------------
 # Part C: K-Means Clustering
 # -----------------------------
-print("\n🤖 Running K-Means clustering on PCA data...")
-
-inertias = []
-silhouettes = []
-K_range = range(2, 10)
-
-for k in K_range:
-    kmeans = KMeans(n_clusters=k, random_state=42)
-    kmeans.fit(X_pca)
-    inertias.append(kmeans.inertia_)
-    silhouettes.append(silhouette_score(X_pca, kmeans.labels_))
-
-# Plot Elbow and Silhouette curves
-fig, ax = plt.subplots(1, 2, figsize=(12, 5))
-ax[0].plot(K_range, inertias, marker='o')
-ax[0].set_title('Elbow Method')
-ax[0].set_xlabel('Number of Clusters (K)')
-ax[0].set_ylabel('Inertia')
-
-ax[1].plot(K_range, silhouettes, marker='o', color='green')
-ax[1].set_title('Silhouette Score')
-ax[1].set_xlabel('Number of Clusters (K)')
-ax[1].set_ylabel('Score')
-plt.show()
-
-# Choose K with best Silhouette score
-best_k = K_range[np.argmax(silhouettes)]
-print(f"\n🎯 Best number of clusters (K) based on Silhouette score: {best_k}")
-
-# Fit final model
-kmeans_final = KMeans(n_clusters=best_k, random_state=42)
-df['Cluster'] = kmeans_final.fit_predict(X_pca)
-
-# Visualize clusters in PCA space
-plt.figure(figsize=(8, 6))
-plt.scatter(X_pca[:, 0], X_pca[:, 1], c=df['Cluster'], cmap='viridis', s=10)
-plt.title(f'K-Means Clusters (K={best_k}) in PCA Space')
-plt.xlabel('Principal Component 1')
-plt.ylabel('Principal Component 2')
-plt.show()
+def cluster_scores(X_pca, k_range=K_RANGE):
+    """(inertias, silhouettes) of K-Means for every K in k_range."""
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    inertias = []
+    silhouettes = []
+    for k in k_range:
+        kmeans = KMeans(n_clusters=k, random_state=42)
+        kmeans.fit(X_pca)
+        inertias.append(kmeans.inertia_)
+        silhouettes.append(silhouette_score(X_pca, kmeans.labels_))
+    return inertias, silhouettes
 
-# -----------------------------
-# Part D: Interpret and Analyze Clusters
-# -----------------------------
-print("\n📊 Analyzing clusters for business insights...")
 
-# Aggregate useful metrics per cluster
-cluster_summary = df.groupby('Cluster')[['MonthlyCharges', 'tenure', 'TotalCharges']].mean()
-cluster_summary['ChurnRate (%)'] = df.groupby('Cluster')['Churn_Yes'].mean() * 100
+def fit_clusters(X_pca, k):
+    from sklearn.cluster import KMeans
 
-print("\nCluster Summary:")
-print(cluster_summary.round(2))
+    return KMeans(n_clusters=k, random_state=42).fit_predict(X_pca)
 
-print("\n🧠 Insights:")
-print("- Clusters may represent different customer profiles, such as:")
-print("  • High-paying long-term customers with low churn risk.")
-print("  • Short-tenure customers with high churn tendency.")
-print("  • Moderate users with average billing and loyalty.")
-print("\n✅ Task complete: PCA, clustering, and insights generated.")
+
+def plot_cluster_scores(k_range, inertias, silhouettes):
+    import matplotlib.pyplot as plt
+
+    # Plot Elbow and Silhouette curves
+    fig, ax = plt.subplots(1, 2, figsize=(12, 5))
+    ax[0].plot(k_range, inertias, marker='o')
+    ax[0].set_title('Elbow Method')
+    ax[0].set_xlabel('Number of Clusters (K)')
+    ax[0].set_ylabel('Inertia')
+
+    ax[1].plot(k_range, silhouettes, marker='o', color='green')
+    ax[1].set_title('Silhouette Score')
+    ax[1].set_xlabel('Number of Clusters (K)')
+    ax[1].set_ylabel('Score')
+    plt.show()
+
+
+def plot_clusters(X_pca, clusters, k):
+    import matplotlib.pyplot as plt
+
+    # Visualize clusters in PCA space
+    plt.figure(figsize=(8, 6))
+    plt.scatter(X_pca[:, 0], X_pca[:, 1], c=clusters, cmap='viridis', s=10)
+    plt.title(f'K-Means Clusters (K={k}) in PCA Space')
+    plt.xlabel('Principal Component 1')
+    plt.ylabel('Principal Component 2')
+    plt.show()
+
+
+# -----------------------------
+# Part D: Interpret and Analyze Clusters
+# -----------------------------
+def cluster_summary(df, df_encoded):
+    # Aggregate useful metrics per cluster
+    summary = df.groupby('Cluster')[['MonthlyCharges', 'tenure', 'TotalCharges']].mean()
+    summary['ChurnRate (%)'] = df_encoded['Churn_Yes'].groupby(df['Cluster']).mean() * 100
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="K-Means clustering and PCA on the Telco churn data.")
+    parser.add_argument("--source", default=URL, help="CSV path or URL (default: the GitHub copy)")
+    parser.add_argument("--local", help="local copy of the CSV to use instead of downloading it")
+    parser.add_argument("--refresh", action="store_true", help="parse the source again even if it is cached")
+    parser.add_argument("--no-plots", action="store_true", help="skip the plots (and the matplotlib import)")
+    args = parser.parse_args(argv)
+
+    print("📥 Loading dataset...")
+    df = load_dataset(args.source, args.local, args.refresh)
+
+    print(f"Data loaded successfully with shape: {df.shape}")
+    print("\nPreview of dataset:")
+    print(df.head())
+
+    df_encoded, X_scaled = preprocess(df)
+    print("\n✅ Data preprocessing complete!")
+
+    print("\n🔍 Applying PCA to reduce data to 2 dimensions...")
+    X_pca, explained = pca_2d(X_scaled)
+    print(f"Total variance explained by 2 components: {np.sum(explained):.2%}")
+    if not args.no_plots:
+        plot_pca(X_pca)
+
+    print("\n🤖 Running K-Means clustering on PCA data...")
+    inertias, silhouettes = cluster_scores(X_pca)
+    if not args.no_plots:
+        plot_cluster_scores(K_RANGE, inertias, silhouettes)
+
+    # Choose K with best Silhouette score
+    best_k = K_RANGE[np.argmax(silhouettes)]
+    print(f"\n🎯 Best number of clusters (K) based on Silhouette score: {best_k}")
+
+    # Fit final model
+    df['Cluster'] = fit_clusters(X_pca, best_k)
+    if not args.no_plots:
+        plot_clusters(X_pca, df['Cluster'], best_k)
+
+    print("\n📊 Analyzing clusters for business insights...")
+    print("\nCluster Summary:")
+    print(cluster_summary(df, df_encoded).round(2))
+
+    print("\n🧠 Insights:")
+    print("- Clusters may represent different customer profiles, such as:")
+    print("  • High-paying long-term customers with low churn risk.")
+    print("  • Short-tenure customers with high churn tendency.")
+    print("  • Moderate users with average billing and loyalty.")
+    print("\n✅ Task complete: PCA, clustering, and insights generated.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+A from-scratch decision tree classifier that grows the one-split Gini examples
+in "titanic homework1.py" (gini_impurity / split_dataset) and the lecture4
+notebook (calculate_gini) into a full tree over many features.
+
+Every feature is sorted once at the start. The builder then keeps one index
+array per feature, in which the samples of each open node sit together and in
+sorted order. A level of the tree is grown by scoring every threshold of every
+open node with cumulative class counts (as in gini_split.py). The index arrays
+are then partitioned in place of a re-sort, so a level costs O(n * features).
+
+With max_bins, every feature is instead quantized once into at most 255
+uint8 bins. Each level then builds per-node, per-bin class histograms with
+one bincount per feature. The cost depends on the number of bins, not on the
+number of distinct values. Splits can be scored with Gini or entropy.
+
+The fitted tree is stored as flat arrays (feature, threshold, left, right,
+value), and predict() walks all rows down the tree together, one NumPy step
+per level.
+
+    tree = DecisionTree(max_depth=3).fit(X, y)
+    tree = DecisionTree(max_depth=8, criterion="entropy", max_bins=255).fit(X, y)
+    tree.predict(X_new)
+    print(tree.export_text(["hours"]))
+"""
+
+import numpy as np
+
+from gini_split import CRITERIA, bin_features, encode_labels, impurity_terms, weighted_impurity
+
+
+class DecisionTree:
+    """
+    Binary classification tree, grown level by level.
+
+    max_depth=None grows until the leaves are pure or too small to split.
+    Nodes with fewer than min_samples_split samples become leaves. criterion
+    is "gini" or "entropy". With max_bins (at most 255), every feature is
+    binned once with gini_split.bin_features and nodes are split on per-bin
+    class histograms instead of the presorted index arrays.
+
+    After fit(), node i tests X[:, feature[i]] <= threshold[i] and sends the
+    row to left[i], else to right[i]. Leaves have feature -1. value[i] holds
+    the class counts that reached node i, in the order of classes_.
+    """
+
+    def __init__(self, max_depth=None, min_samples_split=2, criterion="gini", max_bins=None):
+        if min_samples_split < 2:
+            raise ValueError("min_samples_split must be at least 2")
+        if criterion not in CRITERIA:
+            raise ValueError(f"unknown criterion {criterion!r} (use 'gini' or 'entropy')")
+        self.max_depth = max_depth
+        self.min_samples_split = min_samples_split
+        self.criterion = criterion
+        self.max_bins = max_bins
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        if len(X) != len(y) or not len(X):
+            raise ValueError("X and y must have the same, non-zero number of rows")
+        self.classes_, codes = encode_labels(y)
+        self.n_features_ = X.shape[1]
+        tree = _TreeArrays(len(self.classes_))
+        if self.max_bins is None:
+            self.depth_ = self._grow_presorted(X, codes, tree)
+        else:
+            self.depth_ = self._grow_histogram(X, codes, tree)
+        self.feature = np.array(tree.feature, dtype=np.int32)
+        self.threshold = np.array(tree.threshold, dtype=np.float64)
+        self.left = np.array(tree.left, dtype=np.int32)
+        self.right = np.array(tree.right, dtype=np.int32)
+        self.value = np.array(tree.value, dtype=np.float64).reshape(len(tree.feature), tree.k)
+        return self
+
+    def _splittable(self, sizes, counts, depth):
+        if self.max_depth is not None and depth >= self.max_depth:
+            return np.zeros(len(sizes), dtype=bool)
+        return (sizes >= self.min_samples_split) & (counts.max(axis=1) < sizes)
+
+    def _grow_presorted(self, X, codes, tree):
+        n, n_features = X.shape
+        # per feature: sample indices, grouped by open node and sorted by that feature within it
+        columns = [np.ascontiguousarray(X[:, f]) for f in range(n_features)]
+        order = [np.argsort(column) for column in columns]
+        starts = np.array([0, n])  # segment boundaries, shared by all features
+        nodes = [tree.add(np.bincount(codes, minlength=tree.k))]
+        depth = 0
+
+        while nodes:
+            sizes = np.diff(starts)
+            counts = np.array([tree.value[node] for node in nodes])
+            can_split = self._splittable(sizes, counts, depth)
+            if not can_split.any():
+                break
+            best_score = np.full(len(nodes), np.inf)
+            best_feature = np.full(len(nodes), -1)
+            best_threshold = np.zeros(len(nodes))
+            segment_of = np.repeat(np.arange(len(nodes)), sizes)
+            open_cuts = (segment_of[1:] == segment_of[:-1]) & can_split[segment_of[1:]]
+            for f in range(n_features):
+                segments, scores, thresholds = _best_cuts(
+                    columns[f][order[f]], codes[order[f]], open_cuts, segment_of, starts, counts, self.criterion)
+                better = scores < best_score[segments]
+                segments = segments[better]
+                best_score[segments] = scores[better]
+                best_feature[segments] = f
+                best_threshold[segments] = thresholds[better]
+
+            split = best_feature >= 0
+            if not split.any():
+                break
+            # which side every sample of a splitting node goes to
+            rows = order[0]
+            f_of, t_of = best_feature[segment_of], best_threshold[segment_of]
+            goes_left = np.zeros(n, dtype=bool)
+            goes_left[rows] = X[rows, np.maximum(f_of, 0)] <= t_of
+            keep = np.zeros(n, dtype=bool)
+            keep[rows] = split[segment_of]
+
+            n_left = np.add.reduceat(goes_left[rows] & keep[rows], starts[:-1])
+            n_left = np.where(split, n_left, 0)
+            n_right = np.where(split, sizes - n_left, 0)
+            new_starts = np.zeros(2 * len(nodes) + 1, dtype=np.int64)
+            new_starts[1:] = np.cumsum(np.column_stack([n_left, n_right]).ravel())
+            order = [_partition(a, goes_left, keep, starts, segment_of, new_starts) for a in order]
+
+            children = []
+            for s in np.flatnonzero(split):
+                lo, mid, hi = new_starts[2 * s], new_starts[2 * s + 1], new_starts[2 * s + 2]
+                children.extend(tree.split(nodes[s], int(best_feature[s]), float(best_threshold[s]),
+                                           np.bincount(codes[order[0][lo:mid]], minlength=tree.k),
+                                           np.bincount(codes[order[0][mid:hi]], minlength=tree.k)))
+            starts = np.append(new_starts[np.flatnonzero(np.repeat(split, 2))], new_starts[-1])
+            nodes = children
+            depth += 1
+        return depth
+
+    def _grow_histogram(self, X, codes, tree):
+        bins, edges = bin_features(X, self.max_bins)
+        n_bins = max(len(e) for e in edges) + 1
+        k = tree.k
+        segment = np.zeros(len(X), dtype=np.intp)  # open node of every row still in play
+        rows = np.arange(len(X))
+        nodes = [tree.add(np.bincount(codes, minlength=k))]
+        depth = 0
+
+        while nodes:
+            counts = np.array([tree.value[node] for node in nodes])
+            sizes = counts.sum(axis=1)
+            can_split = self._splittable(sizes, counts, depth)
+            if not can_split.any():
+                break
+            rows = rows[can_split[segment[rows]]]
+            seg, y = segment[rows], codes[rows]
+            base = seg * n_bins
+            best_score = np.full(len(nodes), np.inf)
+            best_feature = np.full(len(nodes), -1)
+            best_bin = np.zeros(len(nodes), dtype=np.intp)
+            for f in range(bins.shape[1]):
+                # class counts per (node, bin); rows left of edge b are in bins 0..b
+                hist = np.bincount((base + bins[rows, f]) * k + y, minlength=len(nodes) * n_bins * k)
+                below = np.cumsum(hist.reshape(len(nodes), n_bins, k), axis=1)[:, :len(edges[f])]
+                n_left = below.sum(axis=2)
+                n_right = sizes[:, None] - n_left
+                above = counts[:, None, :] - below
+                score = (weighted_impurity(n_left, impurity_terms(below, self.criterion).sum(axis=2), self.criterion)
+                         + weighted_impurity(n_right, impurity_terms(above, self.criterion).sum(axis=2),
+                                             self.criterion)) / sizes[:, None]
+                score[(n_left == 0) | (n_right == 0) | ~can_split[:, None]] = np.inf
+                if not score.size:
+                    continue
+                b = np.argmin(score, axis=1)
+                s = score[np.arange(len(nodes)), b]
+                better = s < best_score
+                best_score[better] = s[better]
+                best_feature[better] = f
+                best_bin[better] = b[better]
+
+            split = best_feature >= 0
+            if not split.any():
+                break
+            kept = split[seg]
+            goes_right = bins[rows, np.maximum(best_feature[seg], 0)] > best_bin[seg]
+            child = 2 * (np.cumsum(split) - 1)  # left child segment of every splitting node
+            rows, seg, y = rows[kept], seg[kept], y[kept]
+            segment[rows] = child[seg] + goes_right[kept]
+            child_counts = np.bincount(segment[rows] * k + y, minlength=2 * split.sum() * k).reshape(-1, k)
+
+            children = []
+            for s in np.flatnonzero(split):
+                f, c = int(best_feature[s]), child[s]
+                children.extend(tree.split(nodes[s], f, float(edges[f][best_bin[s]]),
+                                           child_counts[c], child_counts[c + 1]))
+            nodes = children
+            depth += 1
+        return depth
+
+    def apply(self, X):
+        """Leaf index reached by every row of X."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        node = np.zeros(len(X), dtype=np.int32)
+        rows = np.arange(len(X))
+        for _ in range(self.depth_):
+            internal = self.feature[node] >= 0
+            if not internal.any():
+                break
+            f = np.maximum(self.feature[node], 0)
+            go_left = X[rows, f] <= self.threshold[node]
+            node = np.where(internal, np.where(go_left, self.left[node], self.right[node]), node)
+        return node
+
+    def predict_proba(self, X):
+        counts = self.value[self.apply(X)]
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.value[self.apply(X)], axis=1)]
+
+    def export_text(self, feature_names=None):
+        """Indented IF/ELSE rules, in the spirit of the scripts' printed trees."""
+        names = feature_names or [f"feature_{f}" for f in range(self.n_features_)]
+        lines = []
+
+        def walk(node, indent):
+            pad = "|   " * indent
+            if self.feature[node] < 0:
+                lines.append(f"{pad}class: {self.classes_[np.argmax(self.value[node])]}")
+                return
+            name, t = names[self.feature[node]], self.threshold[node]
+            lines.append(f"{pad}IF {name} <= {t:g}")
+            walk(self.left[node], indent + 1)
+            lines.append(f"{pad}ELSE ({name} > {t:g})")
+            walk(self.right[node], indent + 1)
+
+        walk(0, 0)
+        return "\n".join(lines)
+
+
+class _TreeArrays:
+    # the node arrays of a tree being grown, as lists
+    def __init__(self, k):
+        self.k = k
+        self.feature, self.threshold, self.left, self.right, self.value = [], [], [], [], []
+
+    def add(self, counts):
+        self.feature.append(-1)
+        self.threshold.append(np.nan)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.value.append(counts)
+        return len(self.feature) - 1
+
+    def split(self, node, feature, threshold, left_counts, right_counts):
+        self.feature[node] = feature
+        self.threshold[node] = threshold
+        self.left[node] = self.add(left_counts)
+        self.right[node] = self.add(right_counts)
+        return self.left[node], self.right[node]
+
+
+def _best_cuts(x, y, open_cuts, segment_of, starts, counts, criterion):
+    # x and y in index-array order: every segment is one node, sorted by x.
+    # open_cuts[p] says p and p + 1 lie in the same splittable node. Returns
+    # (segment, weighted gini, threshold) of the best cut in every segment that has one.
+    p = np.flatnonzero(open_cuts & (x[1:] != x[:-1]))
+    if not len(p):
+        return p, np.empty(0), np.empty(0)
+    s = segment_of[p]
+    lo = starts[s]
+    n_left = p + 1 - lo
+    n_right = starts[s + 1] - p - 1
+    left_terms = right_terms = 0
+    below = np.zeros(len(x) + 1, dtype=np.int64)  # below[i]: samples of class c before position i
+    for c in range(counts.shape[1]):
+        np.cumsum(y == c, out=below[1:])
+        left = below[p + 1] - below[lo]
+        left_terms = left_terms + impurity_terms(left, criterion)
+        right_terms = right_terms + impurity_terms(counts[s, c] - left, criterion)
+    score = (weighted_impurity(n_left, left_terms, criterion)
+             + weighted_impurity(n_right, right_terms, criterion)) / (n_left + n_right)
+
+    # lowest score per segment; candidates are already grouped by segment
+    first = np.flatnonzero(np.r_[True, s[1:] != s[:-1]])
+    best = np.minimum.reduceat(score, first)
+    at_best = score == np.repeat(best, np.diff(np.r_[first, len(s)]))
+    hits = np.flatnonzero(at_best)
+    hits = hits[np.r_[True, s[hits][1:] != s[hits][:-1]]]  # first cut reaching the minimum
+    return s[hits], score[hits], (x[p[hits]] + x[p[hits] + 1]) / 2
+
+
+def _partition(a, goes_left, keep, starts, segment_of, new_starts):
+    # Stable partition of every kept segment of a into its left samples, then its
+    # right samples, at the positions given by new_starts. Samples of segments
+    # that became leaves are dropped. One pass, no sort.
+    kept = keep[a]
+    left = kept & goes_left[a]
+    right = kept & ~goes_left[a]
+    left_rank = np.cumsum(left) - left
+    right_rank = np.cumsum(right) - right
+    seg_lo = starts[:-1][segment_of]
+    left_rank -= left_rank[seg_lo]
+    right_rank -= right_rank[seg_lo]
+    position = np.where(left, new_starts[2 * segment_of] + left_rank,
+                        new_starts[2 * segment_of + 1] + right_rank)
+    out = np.empty(new_starts[-1], dtype=a.dtype)
+    out[position[kept]] = a[kept]
+    return out
+
+
+if __name__ == "__main__":
+    # the students example from the homework, then a bigger random check
+    hours = np.array([2, 4, 6, 8, 10])
+    passed = np.array([0, 0, 1, 1, 1])
+    tree = DecisionTree().fit(hours, passed)
+    print(tree.export_text(["study_hours"]))
+    print("predictions:", tree.predict(hours))
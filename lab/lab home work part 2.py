@@ -1,32 +1,14 @@
 # 🌳 Decision Tree - Part 2 (Manual Gini + Optional sklearn check)
 # Let's predict if a student passes or fails based on how many hours they study.
 
-import pandas as pd
+import argparse
 
-# -----------------------------
-# 🧩 Step 1: Create our small dataset
-# -----------------------------
-data = pd.DataFrame({
-    'Student': [1, 2, 3, 4, 5],
-    'Study_Hours': [2, 4, 6, 8, 10],
-    'Pass': [0, 0, 1, 1, 1]
-})
-
-print("📘 Our Dataset:")
-print(data, "\n")
+from gini_split import gini_split_table
 
 # -----------------------------
-# 🪓 Step 2: Find possible split points
-# (Between every two consecutive study hour values)
-# -----------------------------
-unique_hours = sorted(data['Study_Hours'].unique())
-split_points = [(unique_hours[i] + unique_hours[i+1]) / 2 for i in range(len(unique_hours)-1)]
-
-print("📍 Possible places to split the data:", split_points, "\n")
-
-# -----------------------------
-# ⚖️ Step 3: Define a function to calculate Gini impurity
-# (This measures how 'mixed' or 'impure' a group is)
+# ⚖️ Helper: Gini impurity of one split, computed by hand
+# (This measures how 'mixed' or 'impure' a group is; Step 4 uses it to
+#  double-check the best split from the table)
 # -----------------------------
 def gini_for_groups(groups):
     total = sum(len(g) for g in groups)
@@ -47,52 +29,85 @@ def gini_for_groups(groups):
     
     return gini
 
+
 # -----------------------------
-# 🔢 Step 4: Try each split and calculate its Gini impurity
+# 🤖 Step 6 (Optional): Check with sklearn’s DecisionTreeClassifier
+# (run with --sklearn; sklearn is only imported then)
 # -----------------------------
-results = []
+def sklearn_check(data):
+    from sklearn.tree import DecisionTreeClassifier, export_text
 
-for split in split_points:
-    left = data[data['Study_Hours'] <= split]   # Students who study less than or equal to split
-    right = data[data['Study_Hours'] > split]   # Students who study more than split
-    
-    gini = gini_for_groups([left, right])
-    results.append({
-        'Split_At': split,
-        'Left_Group_Size': len(left),
-        'Right_Group_Size': len(right),
-        'Gini_Impurity': round(gini, 3)
-    })
+    X = data[['Study_Hours']]
+    y = data['Pass']
 
-results_df = pd.DataFrame(results)
-print("📊 Gini impurity for each possible split:")
-print(results_df, "\n")
+    model = DecisionTreeClassifier(criterion='gini', random_state=0)
+    model.fit(X, y)
 
-# -----------------------------
-# 🏆 Step 5: Pick the best split (lowest Gini impurity)
-# -----------------------------
-best_split = results_df.loc[results_df['Gini_Impurity'].idxmin()]
-print("✅ Best Split Found:")
-print(best_split, "\n")
+    print("🤖 sklearn’s Decision Tree result:")
+    print(export_text(model, feature_names=['Study_Hours']))
 
-# -----------------------------
-# 🌲 Step 6: Simple Text Visualization of the Final Decision Tree
-# -----------------------------
-threshold = best_split['Split_At']
-print("🌳 Our Simple Decision Tree:")
-print(f"IF Study_Hours <= {threshold} → ❌ FAIL (0)")
-print(f"ELSE → ✅ PASS (1)\n")
 
-# -----------------------------
-# 🤖 Step 7 (Optional): Check with sklearn’s DecisionTreeClassifier
-# -----------------------------
-from sklearn.tree import DecisionTreeClassifier, export_text
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manual Gini split search for the study-hours data.")
+    parser.add_argument("--sklearn", action="store_true", help="also fit sklearn's DecisionTreeClassifier")
+    args = parser.parse_args(argv)
 
-X = data[['Study_Hours']]
-y = data['Pass']
+    import pandas as pd
 
-model = DecisionTreeClassifier(criterion='gini', random_state=0)
-model.fit(X, y)
+    # -----------------------------
+    # 🧩 Step 1: Create our small dataset
+    # -----------------------------
+    data = pd.DataFrame({
+        'Student': [1, 2, 3, 4, 5],
+        'Study_Hours': [2, 4, 6, 8, 10],
+        'Pass': [0, 0, 1, 1, 1]
+    })
 
-print("🤖 sklearn’s Decision Tree result:")
-print(export_text(model, feature_names=['Study_Hours']))
+    print("📘 Our Dataset:")
+    print(data, "\n")
+
+    # -----------------------------
+    # 🪓 Step 2: Find possible split points
+    # (Between every two consecutive study hour values)
+    # -----------------------------
+    unique_hours = sorted(data['Study_Hours'].unique())
+    split_points = [(unique_hours[i] + unique_hours[i+1]) / 2 for i in range(len(unique_hours)-1)]
+
+    print("📍 Possible places to split the data:", split_points, "\n")
+
+    # -----------------------------
+    # 🔢 Step 3: Try each split and calculate its Gini impurity
+    # (gini_for_groups above shows the idea one split at a time; gini_split_table
+    #  sorts Study_Hours once and scores every split together, so it stays fast
+    #  on millions of rows)
+    # -----------------------------
+    results_df = gini_split_table(data, 'Study_Hours', 'Pass').round({'Gini_Impurity': 3})
+    print("📊 Gini impurity for each possible split:")
+    print(results_df, "\n")
+
+    # -----------------------------
+    # 🏆 Step 4: Pick the best split (lowest Gini impurity)
+    # -----------------------------
+    best_split = results_df.loc[results_df['Gini_Impurity'].idxmin()]
+    print("✅ Best Split Found:")
+    print(best_split, "\n")
+
+    # Double-check it by hand: split the students and score the two groups
+    threshold = best_split['Split_At']
+    left = data[data['Study_Hours'] <= threshold]
+    right = data[data['Study_Hours'] > threshold]
+    print(f"🔎 Gini by hand for Study_Hours <= {threshold}: {gini_for_groups([left, right]):.3f}\n")
+
+    # -----------------------------
+    # 🌲 Step 5: Simple Text Visualization of the Final Decision Tree
+    # -----------------------------
+    print("🌳 Our Simple Decision Tree:")
+    print(f"IF Study_Hours <= {threshold} → ❌ FAIL (0)")
+    print(f"ELSE → ✅ PASS (1)\n")
+
+    if args.sklearn:
+        sklearn_check(data)
+
+
+if __name__ == "__main__":
+    main()
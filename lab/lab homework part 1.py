@@ -1,21 +1,7 @@
-import pandas as pd
+from gini_split import gini_split_table
 
-# 📘 Step 1: Create the dataset
-# Each student has study hours and whether they passed (1) or failed (0)
-data = pd.DataFrame({
-    'Student': [1, 2, 3, 4, 5],
-    'Study_Hours': [2, 4, 6, 8, 10],
-    'Pass': [0, 0, 1, 1, 1]
-})
-
-# 📍 Step 2: Find possible split points
-# We can split between consecutive study hour values
-unique_hours = sorted(data['Study_Hours'].unique())
-split_points = [(unique_hours[i] + unique_hours[i+1]) / 2 for i in range(len(unique_hours)-1)]
-
-print("👉 Possible split points:", split_points)
-
-# 📊 Step 3: Define a helper function to calculate Gini impurity
+# 📊 Helper: Gini impurity of one split, computed by hand
+# (used in Step 4 to double-check the best split from the table)
 def gini_for_groups(groups):
     total = sum(len(group) for group in groups)
     gini = 0.0
@@ -36,22 +22,45 @@ def gini_for_groups(groups):
     
     return gini
 
-# 🧮 Step 4: Try each possible split and calculate Gini impurity
-results = []
 
-for split in split_points:
-    left_group = data[data['Study_Hours'] <= split]
-    right_group = data[data['Study_Hours'] > split]
-    
-    gini = gini_for_groups([left_group, right_group])
-    results.append({'Split_At': split, 'Gini_Impurity': round(gini, 3)})
+def main():
+    import pandas as pd
+
+    # 📘 Step 1: Create the dataset
+    # Each student has study hours and whether they passed (1) or failed (0)
+    data = pd.DataFrame({
+        'Student': [1, 2, 3, 4, 5],
+        'Study_Hours': [2, 4, 6, 8, 10],
+        'Pass': [0, 0, 1, 1, 1]
+    })
+
+    # 📍 Step 2: Find possible split points
+    # We can split between consecutive study hour values
+    unique_hours = sorted(data['Study_Hours'].unique())
+    split_points = [(unique_hours[i] + unique_hours[i+1]) / 2 for i in range(len(unique_hours)-1)]
+
+    print("👉 Possible split points:", split_points)
+
+    # 🧮 Step 3: Try each possible split and calculate Gini impurity
+    # gini_split_table sorts Study_Hours once and scores every split in one NumPy
+    # pass, instead of filtering the DataFrame again for each split
+    results_df = gini_split_table(data, 'Study_Hours', 'Pass')[['Split_At', 'Gini_Impurity']].round(3)
+
+    # 🏁 Step 4: Show all results and pick the best split (lowest Gini)
+    best_split = results_df.loc[results_df['Gini_Impurity'].idxmin()]
+
+    print("\n📊 Gini Impurity for each split:")
+    print(results_df)
+
+    print("\n✅ Best split found:")
+    print(best_split)
 
-# 🏁 Step 5: Show all results and pick the best split (lowest Gini)
-results_df = pd.DataFrame(results)
-best_split = results_df.loc[results_df['Gini_Impurity'].idxmin()]
+    # Double-check the best split by hand with gini_for_groups
+    threshold = best_split['Split_At']
+    left = data[data['Study_Hours'] <= threshold]
+    right = data[data['Study_Hours'] > threshold]
+    print(f"\n🔎 Gini by hand for Study_Hours <= {threshold}: {gini_for_groups([left, right]):.3f}")
 
-print("\n📊 Gini Impurity for each split:")
-print(results_df)
 
-print("\n✅ Best split found:")
-print(best_split)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Parallel split search across the features of a wide table.
+
+Each feature's best split (gini_split.split_scores) is independent of the
+others, so the features are spread over a concurrent.futures process pool.
+The columns and the encoded labels are copied once into shared memory
+(SharedArray). Workers attach to those blocks by name instead of receiving
+pickled copies, and each task sends back only (feature, threshold,
+impurity). Split search then scales with the number of cores, and the table
+is never duplicated per process.
+
+    splits = parallel_best_splits(X, y, workers=4)
+    table = parallel_split_table(data, ['Study_Hours', 'Sleep_Hours'], 'Pass')
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from gini_split import encode_labels, split_scores
+
+
+class SharedArray:
+    """
+    A NumPy array backed by a named shared-memory block. It pickles as the
+    block name, so a pool worker that receives it maps the same memory. The
+    process that created it must call unlink() when done (or use it as a
+    context manager).
+    """
+
+    def __init__(self, shape, dtype, order="C", name=None):
+        self.shape, self.dtype, self.order = tuple(shape), np.dtype(dtype), order
+        size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = _attach(name)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf, order=order)
+
+    @classmethod
+    def from_array(cls, array, order="C"):
+        shared = cls(array.shape, array.dtype, order)
+        shared.array[...] = array
+        return shared
+
+    def __getstate__(self):
+        return {"name": self.shm.name, "shape": self.shape, "dtype": self.dtype.str, "order": self.order}
+
+    def __setstate__(self, state):
+        self.__init__(state["shape"], state["dtype"], state["order"], state["name"])
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+
+    def unlink(self):
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+
+def _attach(name):
+    # only the creating process registers the block with the resource tracker
+    # and unlinks it. Workers share that tracker (under fork, spawn and
+    # forkserver alike), so an attaching worker must never unregister it:
+    # that would drop the owner's registration. From 3.13 on, attaching skips
+    # registration. Before 3.13 it registers again, and the tracker ignores
+    # that because it keeps a set of names.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class _Local:
+    # the in-process stand-in for SharedArray when no pool is used
+    def __init__(self, array):
+        self.array = array
+
+
+_split_columns = None
+_split_codes = None
+_split_options = None
+
+
+def _init_split_worker(columns, codes, options):
+    global _split_columns, _split_codes, _split_options
+    _split_columns, _split_codes, _split_options = columns, codes, options
+
+
+def _feature_split(f):
+    scores = split_scores(_split_columns.array[:, f], _split_codes.array, **_split_options)
+    if not len(scores["impurity"]):
+        return f, None, np.inf
+    i = int(np.argmin(scores["impurity"]))
+    return f, float(scores["split_at"][i]), float(scores["impurity"][i])
+
+
+def parallel_best_splits(X, y, criterion="gini", max_bins=None, workers=None):
+    """
+    Best (threshold, impurity) for every column of X, in column order. Columns
+    with a single value give (None, inf). workers=None uses every CPU, and
+    workers=1 runs in this process without shared memory.
+    """
+    X = np.asarray(X)
+    if X.ndim == 1:
+        X = X[:, None]
+    _, codes = encode_labels(y)
+    options = {"criterion": criterion, "max_bins": max_bins}
+    n_features = X.shape[1]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, n_features)
+    if workers <= 1:
+        _init_split_worker(_Local(np.asfortranarray(X)), _Local(codes), options)
+        results = [_feature_split(f) for f in range(n_features)]
+    else:
+        # column-major, so every feature a worker reads is one contiguous slice
+        with SharedArray.from_array(X, order="F") as columns, SharedArray.from_array(codes) as shared_codes:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_split_worker,
+                                     initargs=(columns, shared_codes, options)) as pool:
+                results = list(pool.map(_feature_split, range(n_features)))
+    return [(threshold, impurity) for _, threshold, impurity in results]
+
+
+def parallel_split_table(data, features, target, criterion="gini", max_bins=None, workers=None):
+    """One row per feature with its best Split_At and impurity, best feature first."""
+    import pandas as pd
+
+    splits = parallel_best_splits(data[features].to_numpy(dtype=np.float64), data[target].to_numpy(),
+                                  criterion, max_bins, workers)
+    table = pd.DataFrame({
+        "Feature": features,
+        "Split_At": [threshold for threshold, _ in splits],
+        "Gini_Impurity" if criterion == "gini" else "Entropy": [impurity for _, impurity in splits],
+    })
+    return table.sort_values(table.columns[-1], kind="stable").reset_index(drop=True)
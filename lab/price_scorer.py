@@ -0,0 +1,252 @@
+"""
+NumPy-only scoring for the house-price model of "lab house price.py".
+
+model.predict([[1500, 4, 4, 8]]) goes through pandas and sklearn
+validation for every house. A fitted linear model is only a coefficient
+vector and an intercept. PriceScorer keeps just those two (saved as a tiny
+.npz) and prices a whole array, or a directory of memory-mapped .npy column
+files, with one matrix-vector product per block of rows. Single-house
+requests from many threads go through MicroBatcher, which scores whatever
+has queued up in one call instead of paying the per-call overhead per house.
+
+    scorer = PriceScorer.from_model(model, features=list(X.columns))
+    scorer.predict([[1500, 4, 4, 8]])
+    with MicroBatcher(scorer) as batcher:
+        batcher.predict([1500, 4, 4, 8])
+
+    python price_scorer.py    # batch throughput and single-request p50/p99 latency
+"""
+
+import argparse
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+BLOCK_ROWS = 1 << 20  # rows per matrix-vector product when scoring column files
+
+
+class PriceScorer:
+    """Linear price model: X @ coef + intercept, with the feature names in column order."""
+
+    def __init__(self, coef, intercept, features=None):
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.features = list(features) if features is not None else None
+        if self.features is not None and len(self.features) != len(self.coef):
+            raise ValueError("need one feature name per coefficient")
+
+    @classmethod
+    def from_model(cls, model, features=None):
+        """From anything with coef_ and intercept_ (sklearn LinearRegression, StreamingLinearRegression)."""
+        if features is None and hasattr(model, "feature_names_in_"):
+            features = list(model.feature_names_in_)
+        return cls(model.coef_, model.intercept_, features)
+
+    @classmethod
+    def from_lstsq(cls, beta, features=None):
+        """From the lstsq notebook's beta, whose first entry is the intercept."""
+        beta = np.asarray(beta, dtype=np.float64).ravel()
+        return cls(beta[1:], beta[0], features)
+
+    def save(self, path):
+        arrays = {"coef": self.coef, "intercept": np.array(self.intercept)}
+        if self.features is not None:
+            arrays["features"] = np.array(self.features)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            return cls(f["coef"], f["intercept"], f["features"].tolist() if "features" in f else None)
+
+    def predict(self, X):
+        """Prices for a 2-D array of rows, or for a DataFrame with the model's feature columns."""
+        if self.features is not None and hasattr(X, "columns"):
+            X = X[self.features]
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        return X @ self.coef + self.intercept
+
+    def predict_columns(self, directory, out=None):
+        """
+        Prices for a directory of one .npy file per feature (see save_columns),
+        memory-mapped and scored block by block so the table is never loaded whole.
+        """
+        if self.features is None:
+            raise ValueError("scoring column files needs the feature names")
+        columns = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in self.features]
+        n = len(columns[0])
+        if out is None:
+            out = np.empty(n, dtype=np.float64)
+        block = np.empty((min(BLOCK_ROWS, n), len(columns)), dtype=np.float64)
+        for lo in range(0, n, BLOCK_ROWS):
+            hi = min(lo + BLOCK_ROWS, n)
+            rows = block[:hi - lo]
+            for j, column in enumerate(columns):
+                rows[:, j] = column[lo:hi]
+            np.matmul(rows, self.coef, out=out[lo:hi])
+            out[lo:hi] += self.intercept
+        return out
+
+
+def save_columns(data, directory, features=None):
+    """Writes the given DataFrame columns as <directory>/<name>.npy, one float64 file each."""
+    os.makedirs(directory, exist_ok=True)
+    for name in features if features is not None else data.columns:
+        np.save(os.path.join(directory, f"{name}.npy"), data[name].to_numpy(dtype=np.float64))
+
+
+class MicroBatcher:
+    """
+    Collects single-row requests from any number of threads and scores them
+    together. Each batch takes every request already queued, up to max_batch,
+    so a busy queue gets large batches and an idle one adds no delay. With
+    max_wait > 0 a batch also waits up to that many seconds after its first
+    row for more rows to arrive.
+    """
+
+    def __init__(self, scorer, max_batch=256, max_wait=0.0):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, row):
+        """
+        Queues one row of features and returns a Future for its price. A row
+        that is not numeric or has the wrong number of features fails its own
+        future right away, so it never reaches a batch with other requests.
+        """
+        future = Future()
+        try:
+            row = np.asarray(row, dtype=np.float64)
+            if row.shape != self.scorer.coef.shape:
+                raise ValueError(f"need a row of {len(self.scorer.coef)} features, got shape {row.shape}")
+        except (TypeError, ValueError) as exc:
+            future.set_exception(exc)
+            return future
+        self._requests.put((row, future))
+        return future
+
+    def predict(self, row):
+        return self.submit(row).result()
+
+    def close(self):
+        self._requests.put(None)
+        self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = self._requests.get(timeout=timeout) if timeout > 0 else self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._requests.put(None)  # finish this batch, then stop
+                    break
+                batch.append(item)
+            try:
+                prices = self.scorer.predict(np.stack([row for row, _ in batch]))
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), price in zip(batch, prices.tolist()):
+                future.set_result(price)
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def _latencies(call, rows, clients):
+    # every client thread sends its share of rows one at a time and times each call
+    times = [[] for _ in range(clients)]
+
+    def client(i):
+        for row in rows[i::clients]:
+            t = time.perf_counter()
+            call(row)
+            times[i].append(time.perf_counter() - t)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    t = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t
+    return np.concatenate([np.array(ts) for ts in times]), elapsed
+
+
+def benchmark(rows=2_000_000, requests=20_000, clients=16, seed=0, log=print):
+    rng = np.random.default_rng(seed)
+    features = ["Area (sqft)", "Rooms", "Distance (km)", "Age (years)"]
+    scorer = PriceScorer([0.05284281, 11.97324415, -3.37792642, -0.10033445], 38.5618729, features)
+    X = np.column_stack([rng.uniform(800, 3000, rows), rng.integers(1, 7, rows),
+                         rng.uniform(0, 30, rows), rng.uniform(0, 50, rows)])
+    results = {}
+
+    t = time.perf_counter()
+    scorer.predict(X)
+    seconds = time.perf_counter() - t
+    results["array_rows_per_second"] = rows / seconds
+    log(f"{'array:':15}{rows:,} rows in {seconds * 1e3:8.1f} ms  ({rows / seconds:,.0f} rows/s)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for j, name in enumerate(features):
+            np.save(os.path.join(directory, f"{name}.npy"), X[:, j])
+        t = time.perf_counter()
+        scorer.predict_columns(directory)
+        seconds = time.perf_counter() - t
+    results["column_files_rows_per_second"] = rows / seconds
+    log(f"{'column files:':15}{rows:,} rows in {seconds * 1e3:8.1f} ms  ({rows / seconds:,.0f} rows/s)")
+
+    # single houses: as a one-row DataFrame the way the lab script builds them,
+    # as a bare row, and as a bare row through the micro-batching queue
+    import pandas as pd
+
+    single = X[:requests].tolist()
+    batcher = MicroBatcher(scorer)
+    calls = {
+        "DataFrame row": lambda row: scorer.predict(pd.DataFrame([row], columns=features))[0],
+        "array row":     lambda row: scorer.predict(row)[0],
+        "micro-batched": batcher.predict,
+    }
+    for name, call in calls.items():
+        latencies, elapsed = _latencies(call, single, clients)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+        results[name] = {"requests_per_second": requests / elapsed, "p50_ms": p50, "p99_ms": p99}
+        log(f"{name + ':':15}{requests:,} requests from {clients} threads, {requests / elapsed:10,.0f} req/s, "
+            f"p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+    batcher.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy price scorer.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="rows for the batch scoring runs")
+    parser.add_argument("--requests", type=int, default=20_000, help="single-row requests")
+    parser.add_argument("--clients", type=int, default=16, help="threads sending requests")
+    args = parser.parse_args()
+    benchmark(args.rows, args.requests, args.clients)
@@ -0,0 +1,190 @@
+"""
+Out-of-core Gini statistics for one feature, for data that does not fit in
+memory (gini_impurity in "titanic homework1.py" needs the whole list of
+students at once).
+
+SplitAccumulator keeps only class counts: one row per distinct feature value
+or, when bin edges are given, one row per bin. update() adds a chunk of rows
+and merge() adds another accumulator, so separate workers or files can be
+counted apart and combined afterwards. The counts are all it takes for the
+full impurity table and the best split, which gini_split.score_counts turns
+them into. The result is the same as split_scores on the whole column.
+Memory depends on the number of distinct values (or bins), never on the
+number of rows.
+
+    acc = SplitAccumulator()
+    for batch in read_batches("students.csv", ["hours", "label"], chunksize=100_000):
+        acc.update(batch["hours"], batch["label"])
+    acc.table(), acc.best_split()
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gini_split import score_counts
+
+
+class SplitAccumulator:
+    """
+    Mergeable per-value (or per-bin) class counts for one numeric feature.
+
+    Without edges, thresholds are the midpoints between consecutive distinct
+    values, as in the lab scripts. With edges (increasing thresholds, e.g.
+    gini_split.bin_edges of a sample), rows are counted per bin and the
+    thresholds are the edges. Accumulators can only be merged with ones that
+    use the same edges.
+    """
+
+    def __init__(self, edges=None):
+        self.edges = None if edges is None else np.asarray(edges, dtype=np.float64)
+        self.classes = np.empty(0)
+        if self.edges is None:
+            self.values = np.empty(0)
+            self.counts = np.zeros((0, 0), dtype=np.int64)
+        else:
+            self.values = None
+            self.counts = np.zeros((len(self.edges) + 1, 0), dtype=np.int64)
+
+    @property
+    def rows(self):
+        return int(self.counts.sum())
+
+    def update(self, values, labels):
+        """Adds one chunk of rows (array-likes or pandas Series)."""
+        values = np.asarray(values, dtype=np.float64)
+        labels = np.asarray(labels)
+        if values.shape != labels.shape:
+            raise ValueError("values and labels must have the same length")
+        classes, codes = np.unique(labels, return_inverse=True)
+        k = len(classes)
+        if self.edges is None:
+            keys, where = np.unique(values, return_inverse=True)
+            counts = np.bincount(where * k + codes, minlength=len(keys) * k).reshape(len(keys), k)
+            self._add(keys, classes, counts)
+        else:
+            bins = np.searchsorted(self.edges, values)
+            counts = np.bincount(bins * k + codes, minlength=(len(self.edges) + 1) * k).reshape(-1, k)
+            self._add(None, classes, counts)
+        return self
+
+    def update_records(self, records, feature, target):
+        """Adds rows given as dicts, like the students list: update_records(students, 'hours', 'label')."""
+        records = list(records)
+        return self.update([row[feature] for row in records], [row[target] for row in records])
+
+    def merge(self, other):
+        """Adds the counts of another accumulator, e.g. one filled by a different worker."""
+        if (self.edges is None) != (other.edges is None) or (
+                self.edges is not None and not np.array_equal(self.edges, other.edges)):
+            raise ValueError("only accumulators with the same bin edges can be merged")
+        self._add(other.values, other.classes, other.counts)
+        return self
+
+    def _add(self, keys, classes, counts):
+        # align both count tables on the union of the classes, then on the union of the values
+        union = np.union1d(self.classes, classes) if len(self.classes) else classes
+        mine = self._widen(self.counts, self.classes, union)
+        theirs = self._widen(counts, classes, union)
+        self.classes = union
+        if keys is None:
+            self.counts = mine + theirs
+            return
+        merged, where = np.unique(np.concatenate([self.values, keys]), return_inverse=True)
+        total = np.zeros((len(merged), len(union)), dtype=np.int64)
+        np.add.at(total, where, np.concatenate([mine, theirs]))
+        self.values, self.counts = merged, total
+
+    @staticmethod
+    def _widen(counts, classes, union):
+        if len(classes) == len(union):
+            return counts
+        out = np.zeros((len(counts), len(union)), dtype=np.int64)
+        out[:, np.searchsorted(union, classes)] = counts
+        return out
+
+    def scores(self, criterion="gini"):
+        """The gini_split.split_scores dict over everything counted so far."""
+        below = np.cumsum(self.counts, axis=0)[:-1]
+        totals = self.counts.sum(axis=0)
+        if self.edges is None:
+            split_at = (self.values[:-1] + self.values[1:]) / 2
+        else:
+            filled = below.sum(axis=1)
+            cuts = np.flatnonzero((filled > 0) & (filled < totals.sum()))  # rows on both sides
+            below, split_at = below[cuts], self.edges[cuts]
+        return score_counts(self.classes, split_at, below, totals, criterion)
+
+    def table(self, criterion="gini"):
+        """The Split_At / Left_Group_Size / Right_Group_Size / Gini_Impurity table of the lab scripts."""
+        import pandas as pd
+
+        scores = self.scores(criterion)
+        return pd.DataFrame({
+            "Split_At": scores["split_at"],
+            "Left_Group_Size": scores["left_size"],
+            "Right_Group_Size": scores["right_size"],
+            "Gini_Impurity" if criterion == "gini" else "Entropy": scores["impurity"],
+        })
+
+    def best_split(self, criterion="gini"):
+        """(threshold, impurity) of the best split, or (None, None) if there is none yet."""
+        scores = self.scores(criterion)
+        if not len(scores["impurity"]):
+            return None, None
+        i = int(np.argmin(scores["impurity"]))
+        return float(scores["split_at"][i]), float(scores["impurity"][i])
+
+
+def read_batches(path, columns, chunksize=100_000):
+    """
+    Yields DataFrames of at most chunksize rows with only the given columns,
+    from a CSV file or (with pyarrow installed) a Parquet file.
+    """
+    if str(path).endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("reading Parquet in batches needs pyarrow (pip install pyarrow)") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(columns)):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+
+        yield from pd.read_csv(path, usecols=list(columns), chunksize=chunksize)
+
+
+def accumulate(path, feature, target, edges=None, chunksize=100_000):
+    """Counts one file chunk by chunk and returns its SplitAccumulator."""
+    acc = SplitAccumulator(edges)
+    for batch in read_batches(path, [feature, target], chunksize):
+        batch = batch.dropna()
+        acc.update(batch[feature], batch[target])
+    return acc
+
+
+def _accumulate_job(args):
+    return accumulate(*args)
+
+
+def accumulate_files(paths, feature, target, edges=None, chunksize=100_000, workers=1):
+    """
+    Counts every file (in a process pool with workers > 1) and merges the
+    partial accumulators into one.
+    """
+    jobs = [(path, feature, target, edges, chunksize) for path in paths]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2:
+        parts = map(_accumulate_job, jobs)
+        return _merge_all(parts, edges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge_all(pool.map(_accumulate_job, jobs), edges)
+
+
+def _merge_all(parts, edges):
+    total = SplitAccumulator(edges)
+    for part in parts:
+        total.merge(part)
+    return total
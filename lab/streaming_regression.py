@@ -0,0 +1,147 @@
+"""
+Incremental least-squares linear regression for the house-price data of
+"lab house price.py" and the lstsq notebook, when the listings do not fit
+in memory.
+
+StreamingLinearRegression never stores rows. partial_fit() folds each chunk
+into the row count, the feature and target means, and the centered
+cross-product matrices (the X^T X and X^T y of centered data).
+merge() combines two such summaries exactly, using the pairwise update for
+means and co-moments, so chunks or whole files can be fitted by separate
+workers and added up. The coefficients are the least-squares solution of
+the centered normal equations, and MSE and R^2 follow from the same sums.
+All four match LinearRegression on the full table, up to rounding.
+
+    model = StreamingLinearRegression()
+    for batch in read_batches("listings.csv", features + [target]):
+        model.partial_fit(batch[features], batch[target])
+    model.coef_, model.intercept_, model.mse_, model.r2_
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from streaming_gini import read_batches
+
+
+class StreamingLinearRegression:
+    """
+    Ordinary least squares with an intercept, fitted chunk by chunk.
+    Rank-deficient data gets the minimum-norm solution, like np.linalg.lstsq.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = None
+        self.mean_y = 0.0
+        self.sxx = None  # sum of (x - mean_x)(x - mean_x)^T
+        self.sxy = None  # sum of (x - mean_x)(y - mean_y)
+        self.syy = 0.0   # sum of (y - mean_y)^2
+        self._solution = None
+
+    def partial_fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if len(X) != len(y):
+            raise ValueError("X and y must have the same number of rows")
+        if not len(y):
+            return self
+        chunk = StreamingLinearRegression()
+        chunk.n = len(y)
+        chunk.mean_x, chunk.mean_y = X.mean(axis=0), y.mean()
+        xc, yc = X - chunk.mean_x, y - chunk.mean_y
+        chunk.sxx, chunk.sxy, chunk.syy = xc.T @ xc, xc.T @ yc, yc @ yc
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Adds the statistics of another model, e.g. one fitted by a different worker."""
+        if not other.n:
+            return self
+        if not self.n:
+            self.n, self.mean_x, self.mean_y = other.n, other.mean_x.copy(), other.mean_y
+            self.sxx, self.sxy, self.syy = other.sxx.copy(), other.sxy.copy(), other.syy
+            self._solution = None
+            return self
+        if len(self.mean_x) != len(other.mean_x):
+            raise ValueError("models with different numbers of features cannot be merged")
+        n = self.n + other.n
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        w = self.n * other.n / n
+        self.sxx = self.sxx + other.sxx + w * np.outer(dx, dx)
+        self.sxy = self.sxy + other.sxy + w * dx * dy
+        self.syy = self.syy + other.syy + w * dy * dy
+        self.mean_x = self.mean_x + dx * (other.n / n)
+        self.mean_y = self.mean_y + dy * (other.n / n)
+        self.n = n
+        self._solution = None
+        return self
+
+    def _solve(self):
+        if not self.n:
+            raise ValueError("no rows have been fitted yet")
+        if self._solution is None:
+            coef = np.linalg.lstsq(self.sxx, self.sxy, rcond=None)[0]
+            sse = max(self.syy - 2 * coef @ self.sxy + coef @ self.sxx @ coef, 0.0)
+            self._solution = coef, self.mean_y - self.mean_x @ coef, sse
+        return self._solution
+
+    @property
+    def coef_(self):
+        return self._solve()[0]
+
+    @property
+    def intercept_(self):
+        return float(self._solve()[1])
+
+    @property
+    def mse_(self):
+        """Mean squared error on every row seen, as mean_squared_error(y, predict(X))."""
+        return float(self._solve()[2] / self.n)
+
+    @property
+    def r2_(self):
+        """R^2 on every row seen, as r2_score(y, predict(X))."""
+        sse = self._solve()[2]
+        if self.syy == 0:
+            return 1.0 if sse == 0 else 0.0
+        return float(1 - sse / self.syy)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        coef, intercept, _ = self._solve()
+        return X @ coef + intercept
+
+
+def fit_file(path, features, target, chunksize=100_000):
+    """Fits one CSV or Parquet file chunk by chunk."""
+    model = StreamingLinearRegression()
+    for batch in read_batches(path, list(features) + [target], chunksize):
+        batch = batch.dropna()
+        model.partial_fit(batch[list(features)].to_numpy(dtype=np.float64), batch[target].to_numpy(dtype=np.float64))
+    return model
+
+
+def _fit_file_job(args):
+    return fit_file(*args)
+
+
+def fit_files(paths, features, target, chunksize=100_000, workers=1):
+    """Fits every file (in a process pool with workers > 1) and merges the results."""
+    jobs = [(path, features, target, chunksize) for path in paths]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    model = StreamingLinearRegression()
+    if workers <= 1 or len(jobs) < 2:
+        for job in jobs:
+            model.merge(_fit_file_job(job))
+        return model
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_fit_file_job, jobs):
+            model.merge(part)
+    return model
@@ -0,0 +1,264 @@
+"""
+Headless benchmark for the grid searches in "Haunted house.py".
+
+Generates random, maze and open-field maps, runs every registered search with
+every heuristic on them and records wall-clock time, nodes expanded, peak heap
+size, peak memory and path optimality against a BFS ground truth. greedy_bfs
+and a_star are also timed on the original list-of-lists grid, and their rows
+report the speedup of the flat NumPy backend over it. Results are written as
+JSON and/or CSV so runs can be compared over time.
+
+    python "pathfinding benchmark.py" --sizes 64 256 1024 --json bench.json --csv bench.csv
+"""
+
+import argparse
+import csv
+import heapq
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # never open a window from the benchmark
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SIZES = (64, 128, 256, 512, 1024, 2048, 4096)
+MAP_KINDS = ("random", "maze", "open")
+
+
+def load_pathfinding(path=os.path.join(HERE, "Haunted house.py")):
+    # the file name has a space in it, so it is loaded by path and registered
+    # under an importable name (process pools need to find it again)
+    if "haunted_house" in sys.modules:
+        return sys.modules["haunted_house"]
+    spec = importlib.util.spec_from_file_location("haunted_house", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["haunted_house"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+hh = load_pathfinding()
+
+HEURISTICS = {
+    "manhattan": hh.manhattan,
+    "euclidean": hh.euclidean,
+    "diagonal": hh.diagonal,
+    "octile": hh.octile,
+}
+
+# name -> (search(grid, start, goal, heuristic), movement, uses_heuristic)
+# New variants only need an entry here to be picked up by the benchmark.
+ALGORITHMS = {
+    "greedy_bfs": (hh.greedy_bfs, 4, True),
+    "a_star": (hh.a_star, 4, True),
+    "a_star_compact": (lambda grid, start, goal, h: hh.a_star(grid, start, goal, h, compact=True), 4, True),
+    "bidirectional_a_star": (hh.bidirectional_a_star, 4, True),
+    "bidirectional_bfs": (lambda grid, start, goal, h: hh.bidirectional_bfs(grid, start, goal), 4, False),
+    "dstar_lite": (lambda grid, start, goal, h: hh.DStarLite(grid, start, goal, h).replan(), 4, True),
+    "jump_point_search": (hh.jump_point_search, 8, True),
+}
+
+# heuristics that stay admissible when a diagonal step costs sqrt(2); the
+# 8-connected searches reject the others, so they are only run with these
+DIAGONAL_HEURISTICS = ("euclidean", "diagonal", "octile")
+
+# searches that still accept the original list-of-lists grid; they are also timed
+# on it, and the rows report the speedup of the flat NumPy backend over it
+LIST_BASELINE = ("greedy_bfs", "a_star")
+
+
+# -----------------------------
+# Map generators (0 = floor, 1 = wall)
+# -----------------------------
+def random_map(size, rng, density=0.25):
+    return (rng.random((size, size)) < density).astype(np.uint8)
+
+
+def maze_map(size, rng):
+    # iterative recursive-backtracker maze carved on the odd cells, which gives the
+    # long winding corridors that are the worst case for the forward searches
+    cells = np.ones((size, size), dtype=np.uint8)
+    rooms = (size - 1) // 2
+    visited = np.zeros((rooms, rooms), dtype=bool)
+    stack = [(0, 0)]
+    visited[0, 0] = True
+    cells[1, 1] = 0
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= r + dr < rooms and 0 <= c + dc < rooms and not visited[r + dr, c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = options[rng.integers(len(options))]
+        visited[nr, nc] = True
+        cells[2 * nr + 1, 2 * nc + 1] = 0
+        cells[r + nr + 1, c + nc + 1] = 0  # knock down the wall between the two rooms
+        stack.append((nr, nc))
+    return cells
+
+
+def open_map(size, rng):
+    # mostly empty field with a few rectangular obstacles
+    cells = np.zeros((size, size), dtype=np.uint8)
+    for _ in range(max(1, size // 8)):
+        h, w = rng.integers(1, max(2, size // 8), 2)
+        r, c = rng.integers(0, size - h), rng.integers(0, size - w)
+        cells[r:r + h, c:c + w] = 1
+    return cells
+
+
+GENERATORS = {"random": random_map, "maze": maze_map, "open": open_map}
+
+
+def pick_endpoints(grid):
+    # opposite corners of the largest connected region, so every search has a path
+    labels = grid.components()
+    sizes = np.bincount(labels)
+    sizes[0] = 0
+    nodes = np.flatnonzero(labels == np.argmax(sizes))
+    rows, cols = np.divmod(nodes, grid.width)
+    corner = rows + cols
+    return grid.cell(int(nodes[np.argmin(corner)])), grid.cell(int(nodes[np.argmax(corner)]))
+
+
+def path_cost(path):
+    return sum(hh.SQRT2 if a[0] != b[0] and a[1] != b[1] else 1 for a, b in zip(path, path[1:]))
+
+
+def ground_truth(grid, start, goal, movement):
+    if movement == 4:
+        path, _ = hh.bidirectional_bfs(grid, start, goal)
+    else:
+        path, _ = hh.a_star(grid, start, goal, hh.octile, diagonal_moves=True)
+    return path_cost(path) if path else None
+
+
+# -----------------------------
+# Measurement
+# -----------------------------
+class HeapProbe:
+    # Stands in for the heapq module inside "Haunted house.py" and records the
+    # largest frontier any search builds. Only used in the untimed second pass.
+    def __init__(self):
+        self.peak = 0
+
+    def heappush(self, heap, item):
+        heapq.heappush(heap, item)
+        if len(heap) > self.peak:
+            self.peak = len(heap)
+
+    heappop = staticmethod(heapq.heappop)
+
+
+def measure(search, grid, start, goal, heuristic, memory=True):
+    t = time.perf_counter()
+    path, explored = search(grid, start, goal, heuristic)
+    seconds = time.perf_counter() - t
+    result = {"seconds": seconds, "explored": explored, "path": path,
+              "peak_heap": None, "peak_memory_bytes": None}
+    if memory:
+        probe = HeapProbe()
+        hh.heapq = probe
+        tracemalloc.start()
+        try:
+            search(grid, start, goal, heuristic)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            hh.heapq = heapq
+        result["peak_heap"] = probe.peak
+    return result
+
+
+def run(sizes, kinds, algorithms, heuristics, seed=0, memory=True, baseline=True, log=print):
+    rows = []
+    for kind in kinds:
+        for size in sizes:
+            rng = np.random.default_rng(seed)
+            grid = hh.NumpyGrid(GENERATORS[kind](size, rng))
+            lists = np.asarray(grid).tolist()
+            start, goal = pick_endpoints(grid)
+            truth = {4: ground_truth(grid, start, goal, 4), 8: None}
+            for name in algorithms:
+                search, movement, uses_heuristic = ALGORITHMS[name]
+                if truth.get(movement) is None:
+                    truth[movement] = ground_truth(grid, start, goal, movement)
+                optimal = truth[movement]
+                names = heuristics if uses_heuristic else [None]
+                if movement == 8 and uses_heuristic:
+                    names = [h_name for h_name in names if h_name in DIAGONAL_HEURISTICS]
+                for h_name in names:
+                    m = measure(search, grid, start, goal, HEURISTICS.get(h_name), memory)
+                    cost = path_cost(m["path"]) if m["path"] else None
+                    list_seconds = speedup = None
+                    if baseline and name in LIST_BASELINE:
+                        list_seconds = measure(search, lists, start, goal, HEURISTICS.get(h_name), False)["seconds"]
+                        speedup = round(list_seconds / m["seconds"], 2) if m["seconds"] else None
+                    row = {
+                        "map": kind, "size": size, "algorithm": name, "heuristic": h_name,
+                        "movement": movement, "seconds": round(m["seconds"], 6),
+                        "explored": m["explored"],
+                        "nodes_per_second": round(m["explored"] / m["seconds"]) if m["seconds"] else None,
+                        "peak_heap": m["peak_heap"], "peak_memory_bytes": m["peak_memory_bytes"],
+                        "path_cost": cost, "optimal_cost": optimal,
+                        "optimality": round(cost / optimal, 6) if cost is not None and optimal else None,
+                        "list_seconds": round(list_seconds, 6) if list_seconds is not None else None,
+                        "speedup_vs_lists": speedup,
+                    }
+                    rows.append(row)
+                    log(f"{kind:6s} {size:5d} {name:22s} {h_name or '-':10s} "
+                        f"{row['seconds']:9.4f}s explored={row['explored']:<9d} "
+                        f"heap={row['peak_heap']} optimality={row['optimality']}"
+                        + (f" {speedup}x vs lists" if speedup is not None else ""))
+    return rows
+
+
+def write_results(rows, json_path=None, csv_path=None):
+    if json_path:
+        meta = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        }
+        with open(json_path, "w") as f:
+            json.dump({"meta": meta, "results": rows}, f, indent=2)
+    if csv_path and rows:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Haunted house grid searches.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[s for s in SIZES if s <= 1024],
+                        help=f"map side lengths (any of {SIZES} or others); default up to 1024")
+    parser.add_argument("--maps", nargs="+", choices=MAP_KINDS, default=list(MAP_KINDS))
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--heuristics", nargs="+", choices=list(HEURISTICS), default=list(HEURISTICS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the second pass that measures peak heap and memory")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="skip timing greedy_bfs and a_star on the original list-of-lists grid")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    args = parser.parse_args(argv)
+
+    rows = run(args.sizes, args.maps, args.algorithms, args.heuristics,
+               seed=args.seed, memory=not args.no_memory, baseline=not args.no_baseline)
+    write_results(rows, args.json, args.csv)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
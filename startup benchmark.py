@@ -0,0 +1,134 @@
+"""
+Cold-start cost of the lab scripts for short-lived batch jobs.
+
+"lab house price.py", "telecom homework.py" and the Gini labs used to import
+pandas, sklearn and matplotlib at the top, even where the computation only
+needs NumPy. They now load those libraries inside the steps that use them.
+For each script this benchmark starts fresh interpreters under
+python -X importtime and compares two things:
+
+    before  the libraries the script imported at the top before it was split up
+    after   loading the script as a module and running what a batch job needs
+            from it (the house price model as a NumPy PriceScorer, the Gini
+            split search; the telecom steps all need pandas, so just the load)
+
+"before" is an approximation of the old scripts' cold start, not a run of
+them: it times their top-level imports by themselves. The old scripts ran
+the whole lab on import (downloading the CSV, opening plot windows), so
+their work after the imports is left out, which makes "before" smaller
+than the real thing. The report says so at the top.
+
+It reports wall-clock time per interpreter and the total import time, along
+with the modules that dominate it. Libraries that are not installed cannot
+be timed, so they are listed, and a "before" that misses them is a lower
+bound.
+
+    python "startup benchmark.py" [--repeat 5] [--top 5]
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# loads a script whose file name has spaces in it, the way "pathfinding benchmark.py" does
+LOAD = """
+import importlib.util, os, sys
+path = {path!r}
+sys.path.insert(0, os.path.dirname(path))
+spec = importlib.util.spec_from_file_location({name!r}, path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+JOBS = {
+    "house price": {
+        "before": ["pandas", "sklearn.linear_model", "sklearn.metrics"],
+        "script": os.path.join(HERE, "lab", "lab house price.py"),
+        "run": "module.house_scorer().predict([[1500, 4, 4, 8]])",
+    },
+    "telecom": {
+        "before": ["pandas", "numpy", "matplotlib.pyplot", "sklearn.preprocessing",
+                   "sklearn.decomposition", "sklearn.cluster", "sklearn.metrics"],
+        "script": os.path.join(HERE, "homework", "telecom homework.py"),
+        "run": "",
+    },
+    "gini lab part 2": {
+        "before": ["pandas", "sklearn.tree", "numpy"],
+        "script": os.path.join(HERE, "lab", "lab home work part 2.py"),
+        "run": "from gini_split import best_split; best_split([2, 4, 6, 8, 10], [0, 0, 1, 1, 1])",
+    },
+}
+
+
+def installed(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:  # the parent package is missing
+        return False
+
+
+def importtime(code):
+    """(wall seconds, {top-level module: cumulative import seconds}) for one fresh interpreter."""
+    t = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=HERE)
+    wall = time.perf_counter() - t
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # nested imports are indented under their importer
+            modules[name.strip()] = modules.get(name.strip(), 0) + int(cumulative) / 1e6
+    return wall, modules
+
+
+def measure(code, repeat):
+    # best of several runs, so that disk cache warm-up does not count
+    runs = [importtime(code) for _ in range(repeat)]
+    return min(runs, key=lambda run: run[0])
+
+
+def run(repeat=5, top=5, log=print):
+    results = {}
+    bare, _ = measure("pass", repeat)
+    log(f"bare interpreter: {bare * 1e3:.0f} ms")
+    log("before = the old scripts' top-level imports only (approx.: their computation is not run)")
+    for name, job in JOBS.items():
+        missing = [module for module in job["before"] if not installed(module)]
+        before_code = "\n".join(f"import {module}" for module in job["before"] if module not in missing)
+        after_code = LOAD.format(path=job["script"], name=name.replace(" ", "_")) + job["run"]
+        row = {}
+        for label, code in (("before", before_code or "pass"), ("after", after_code)):
+            wall, modules = measure(code, repeat)
+            total = sum(modules.values())
+            row[label] = {"wall": wall, "imports": total}
+            heaviest = sorted(modules.items(), key=lambda item: -item[1])[:top]
+            log(f"{name:16} {label:6} wall {wall * 1e3:7.0f} ms   imports {total * 1e3:7.0f} ms   "
+                + ", ".join(f"{module} {seconds * 1e3:.0f}" for module, seconds in heaviest))
+        if missing:
+            log(f"{'':16} not installed, so not in 'before': {', '.join(missing)}")
+        saved = row["before"]["wall"] - row["after"]["wall"]
+        log(f"{'':16} cold start about {saved * 1e3:.0f} ms faster"
+            f"{' (at least)' if missing else ''}")
+        results[name] = row
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the import-time cost of the lab scripts.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement (best is kept)")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list")
+    args = parser.parse_args(argv)
+    run(args.repeat, args.top)
+
+
+if __name__ == "__main__":
+    main()
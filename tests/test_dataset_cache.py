@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "homework"))
+
+import dataset_cache  # noqa: E402
+
+
+@pytest.fixture
+def csv(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATASET_CACHE", str(tmp_path / "cache"))
+    path = tmp_path / "data.csv"
+    path.write_text("id,name\n1,a\n2,b\n")
+    return path
+
+
+def test_unchanged_local_file_is_not_hashed_again(csv, monkeypatch):
+    first = dataset_cache.load_columns(str(csv))
+    assert first["id"].tolist() == [1, 2]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the file was hashed again")
+
+    monkeypatch.setattr(dataset_cache, "source_key", fail)
+    assert dataset_cache.load_columns(str(csv))["name"].tolist() == ["a", "b"]
+
+
+def test_edited_local_file_is_parsed_again(csv):
+    dataset_cache.load_columns(str(csv))
+    stat = os.stat(csv)
+    csv.write_text("id,name\n1,a\n2,c\n")  # same size
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert dataset_cache.load_columns(str(csv))["name"].tolist() == ["a", "c"]
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_search import CSRGraph, a_star, dijkstra  # noqa: E402
+
+GRAPH = {"A": [("B", 1), ("C", 4)], "B": [("C", 1), ("D", 5)], "C": [("D", 1)], "D": []}
+COORDINATES = {"A": (0, 0), "B": (1, 0), "C": (1, 1), "D": (2, 1)}
+
+
+def test_a_star_without_coordinates_asks_for_dijkstra():
+    for graph in (GRAPH, CSRGraph.from_dict(GRAPH)):
+        with pytest.raises(ValueError, match="use dijkstra"):
+            a_star(graph, "A", "D")
+
+
+def test_a_star_matches_dijkstra():
+    expected = dijkstra(GRAPH, "A", "D")
+    assert expected == (["A", "B", "C", "D"], 3)
+    assert a_star(GRAPH, "A", "D", COORDINATES) == expected
+    assert a_star(CSRGraph.from_dict(GRAPH, COORDINATES), "A", "D") == expected
+    assert a_star(CSRGraph.from_dict(GRAPH), "A", "D", COORDINATES) == expected
@@ -0,0 +1,141 @@
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def hh():
+    # the file name has a space in it, so it is loaded by path as in "pathfinding benchmark.py"
+    if "haunted_house" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("haunted_house", os.path.join(ROOT, "Haunted house.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["haunted_house"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["haunted_house"]
+
+
+def random_grid(rng, size, density):
+    return (rng.random((size, size)) < density).astype(np.uint8)
+
+
+def test_landmarks_cover_every_component(hh):
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        grid = hh.NumpyGrid(random_grid(rng, 60, 0.3))
+        landmarks = hh.build_landmarks(grid, 8)
+        labels = grid.components()
+        assert (np.asarray(landmarks.table)[0][labels > 0] >= 0).all()
+        for label in np.unique(labels[labels > 0]):
+            nodes = np.flatnonzero(labels == label)
+            if nodes.size < 2:
+                continue
+            for a, b in rng.choice(nodes, (10, 2)):
+                true = hh._bfs_distances(grid, int(b))[a]
+                assert landmarks.node_heuristic(grid.cell(int(b)))(int(a)) <= true
+
+
+def test_landmark_cache_is_keyed_on_the_walls(hh, tmp_path):
+    rng = np.random.default_rng(4)
+    map_path = str(tmp_path / "map.txt")
+    first, second = random_grid(rng, 40, 0.3), random_grid(rng, 40, 0.3)
+    hh.load_landmarks(first, map_path)
+    # same shape, different walls: the cached table must not be reused
+    reloaded = hh.load_landmarks(second, map_path)
+    np.testing.assert_array_equal(np.asarray(reloaded.table), hh.build_landmarks(second).table)
+    again = hh.load_landmarks(second, map_path)
+    np.testing.assert_array_equal(np.asarray(again.table), np.asarray(reloaded.table))
+
+
+def test_batch_matches_a_star_on_a_cost_grid(hh):
+    costs = np.ones((3, 5))
+    costs[0, 1:4] = 10  # the straight top-row path is expensive
+    grid = hh.CostGrid(costs)
+    expected = hh.a_star(grid, (0, 0), (0, 4), hh.manhattan)
+    assert (1, 2) in expected[0]  # goes around through row 1
+    assert hh.a_star_batch(grid, [((0, 0), (0, 4))])[0] == expected
+
+    rng = np.random.default_rng(5)
+    terrain = rng.integers(1, 9, (30, 30)).astype(float)
+    terrain[rng.random((30, 30)) < 0.2] = np.inf
+    grid = hh.CostGrid(terrain)
+    open_cells = [tuple(cell) for cell in np.argwhere(np.isfinite(terrain))]
+    queries = [(open_cells[i], open_cells[j]) for i, j in rng.integers(0, len(open_cells), (20, 2))]
+    batch = hh.a_star_batch(grid, queries, workers=2)
+    for (start, goal), (path, _) in zip(queries, batch):
+        reference, _ = hh.a_star(grid, start, goal, hh.manhattan)
+        cost = lambda p: sum(terrain[cell] for cell in p[1:])
+        assert bool(path) == bool(reference)
+        if path:
+            assert cost(path) == cost(reference)
+
+
+def test_batch_matches_a_star_per_pair(hh):
+    rng = np.random.default_rng(7)
+    cells = random_grid(rng, 40, 0.35)
+    grid = hh.NumpyGrid(cells)
+    labels = grid.components()
+    queries = [tuple(map(tuple, rng.integers(0, 40, (2, 2)))) for _ in range(200)]
+    batch = hh.a_star_batch(grid, queries)
+    reachable = unreachable = 0
+    for (start, goal), result in zip(queries, batch):
+        source, target = grid.node(start), grid.node(goal)
+        if labels[source] and labels[source] == labels[target]:
+            assert result == hh.a_star(grid, start, goal, hh.manhattan)
+            reachable += 1
+        else:
+            # fails fast without searching; a_star finds no path either unless it
+            # starts on a wall and steps off it
+            assert result == ([], 0)
+            if labels[source]:
+                assert hh.a_star(grid, start, goal, hh.manhattan)[0] == []
+            unreachable += 1
+    assert reachable and unreachable
+
+
+@pytest.mark.parametrize("name", ["manhattan", "euclidean", "diagonal", "octile"])
+def test_flat_searches_match_the_list_searches(hh, name):
+    heuristic = getattr(hh, name)
+    rng = np.random.default_rng(11)
+    for size, density in ((30, 0.3), (60, 0.2), (60, 0.0)):
+        cells = random_grid(rng, size, density)
+        grid, lists = hh.NumpyGrid(cells), cells.tolist()
+        for _ in range(10):
+            start, goal = (tuple(map(int, rng.integers(0, size, 2))) for _ in range(2))
+            for search in (hh.greedy_bfs, hh.a_star):
+                assert search(grid, start, goal, heuristic) == search(lists, start, goal, heuristic)
+
+
+def test_compact_a_star_finds_shortest_paths(hh):
+    rng = np.random.default_rng(13)
+    for size, density in ((40, 0.3), (120, 0.25)):  # 120 wide spans many 1024-node chunks
+        grid = hh.NumpyGrid(random_grid(rng, size, density))
+        for _ in range(20):
+            start, goal = (tuple(map(int, rng.integers(0, size, 2))) for _ in range(2))
+            path, explored = hh.a_star(grid, start, goal, hh.manhattan, compact=True)
+            reference, reference_explored = hh.a_star(grid, start, goal, hh.manhattan)
+            assert len(path) == len(reference)
+            assert explored == reference_explored
+            if path:
+                assert path[0] == start and path[-1] == goal
+                assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and not grid.walls[grid.node(b)]
+                           for a, b in zip(path, path[1:]))
+
+
+def test_eight_connected_searches_reject_inadmissible_heuristics(hh):
+    grid = hh.NumpyGrid(np.zeros((20, 20), dtype=np.uint8))
+    searches = (lambda h: hh.a_star(grid, (0, 0), (19, 19), h, diagonal_moves=True),
+                lambda h: hh.jump_point_search(grid, (0, 0), (19, 19), h))
+    for search in searches:
+        for heuristic in (hh.manhattan, hh.build_landmarks(grid, 2)):
+            with pytest.raises(ValueError, match="admissible"):
+                search(heuristic)
+        for heuristic in (hh.octile, hh.euclidean, hh.diagonal):
+            path, _ = search(heuristic)
+            assert path[0] == (0, 0) and path[-1] == (19, 19)
+    # 19 diagonal steps
+    assert len(hh.a_star(grid, (0, 0), (19, 19), hh.octile, diagonal_moves=True)[0]) == 20
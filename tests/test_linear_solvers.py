@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "homework"))
+
+from linear_solvers import fit_line  # noqa: E402
+
+
+@pytest.mark.parametrize("n", [100, 10_000, 200_000])
+def test_sgd_matches_closed_form(n):
+    rng = np.random.default_rng(n)
+    X = rng.uniform(0, 10, n)
+    Y = 3 * X + 2 + rng.normal(size=n) * 1.5
+    exact = fit_line(X, Y, "closed_form")
+    sgd = fit_line(X, Y, "sgd")
+    assert sgd["converged"]
+    assert sgd["slope"] == pytest.approx(exact["slope"], abs=5e-3)
+    assert sgd["intercept"] == pytest.approx(exact["intercept"], abs=2e-2)
+    assert sgd["mse"] == pytest.approx(exact["mse"], rel=1e-4)
+
+
+def test_sgd_matches_closed_form_on_several_features():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(5000, 3)) * [1, 100, 0.01] + [5, -50, 3]
+    y = X @ [2, -0.1, 40] + 7 + rng.normal(size=5000)
+    exact = fit_line(X, y, "closed_form")
+    sgd = fit_line(X, y, "sgd")
+    assert sgd["converged"]
+    np.testing.assert_allclose(sgd["coef"] * X.std(axis=0), exact["coef"] * X.std(axis=0), atol=1e-2)
+    assert sgd["mse"] == pytest.approx(exact["mse"], rel=1e-3)
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+LAB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lab")
+
+SCRIPT = """
+import multiprocessing as mp
+import numpy as np
+from gini_split import best_split
+from parallel_split import parallel_best_splits
+
+if __name__ == "__main__":
+    mp.set_start_method({method!r})
+    rng = np.random.default_rng(0)
+    X = rng.random((2000, 4))
+    y = (X[:, 1] > 0.4).astype(int)
+    splits = parallel_best_splits(X, y, workers=2)
+    assert splits == parallel_best_splits(X, y, workers=1)
+    assert np.isclose(splits[1][0], best_split(X[:, 1], y)[0])
+    print("ok")
+"""
+
+
+@pytest.mark.parametrize("method", ["spawn", "forkserver", "fork"])
+def test_pool_leaves_the_resource_tracker_quiet(method):
+    result = subprocess.run([sys.executable, "-c", SCRIPT.format(method=method)],
+                            cwd=LAB, capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
+    assert result.stderr == ""
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lab"))
+
+from price_scorer import MicroBatcher, PriceScorer  # noqa: E402
+
+
+def test_bad_rows_fail_alone_in_a_mixed_batch():
+    scorer = PriceScorer([0.05, 12.0, -3.4, -0.1], 38.5)
+    rows = [[1500, 4, 4, 8], [1, 1], [1, 1, 1, 1], ["a", 1, 1, 1], [2000, 3, 10, 20], [[1, 2], [3, 4]]]
+    bad = [False, True, False, True, False, True]
+    # a long max_wait lets every request land in the same batch
+    with MicroBatcher(scorer, max_wait=0.2) as batcher:
+        futures = [batcher.submit(row) for row in rows]
+        for row, is_bad, future in zip(rows, bad, futures):
+            if is_bad:
+                with pytest.raises(ValueError):
+                    future.result(timeout=5)
+            else:
+                assert future.result(timeout=5) == pytest.approx(scorer.predict(row)[0])
+
+
+def test_batched_prices_match_array_scoring():
+    rng = np.random.default_rng(0)
+    scorer = PriceScorer(rng.normal(size=4), 10.0)
+    X = rng.uniform(0, 100, (200, 4))
+    with MicroBatcher(scorer) as batcher:
+        prices = [batcher.predict(row) for row in X.tolist()]
+    assert np.allclose(prices, scorer.predict(X))